@@ -5,8 +5,12 @@ Authentication and authorization for the API.
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from typing import Optional
+import functools
 import os
+import time
+import bcrypt
 import jwt
+import jwt.api_jws
 from datetime import datetime, timedelta
 from pydantic import BaseModel
 
@@ -17,6 +21,8 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key")  # Change in production
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+# bcrypt cost factor; each +1 doubles hashing time, so raise it as hardware improves
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "10"))
 
 class Token(BaseModel):
     access_token: str
@@ -42,18 +48,25 @@ fake_users_db = {
         "email": "admin@example.com",
         "disabled": False,
         "permissions": ["admin"],
-        "hashed_password": "$2b$12$R8hhJGs9FeVKZY5bWLrJfufVMxKEYmkRq.mzb0M5vDXXcoG5j3nF6"  # "password"
+        "hashed_password": "$2b$10$EeJrx44ccaZzCEC3inO9JOJVEvHtmj/Z5SESuwZg287EbXASGbzWy"  # "password"
     }
 }
 
 def verify_password(plain_password, hashed_password):
     """
-    Verify password against hash
+    Verify password against a bcrypt hash
     
-    In a real application, use a proper password hashing library like bcrypt
+    bcrypt.checkpw compares the derived hash in constant time.
     """
-    # This is a placeholder - in a real app use proper password verification
-    return plain_password == "password"  # INSECURE, for demonstration only
+    try:
+        return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
+    except ValueError:
+        # Malformed hash
+        return False
+
+def get_password_hash(password: str) -> str:
+    """Hash a password with bcrypt using the configured cost factor"""
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
 
 def get_user(db, username: str):
     """Get user from database"""
@@ -81,6 +94,16 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+@functools.lru_cache(maxsize=4096)
+def _decode_unverified(token: str) -> dict:
+    """
+    Decode a token's claims without checking its signature or expiry
+    
+    Only the JSON decode is cached; callers must verify the signature
+    and expiry on every request.
+    """
+    return jwt.decode(token, options={"verify_signature": False, "verify_exp": False})
+
 async def get_current_user(token: str = Depends(oauth2_scheme)):
     """Get current user from JWT token"""
     credentials_exception = HTTPException(
@@ -89,13 +112,20 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-        token_data = TokenData(username=username)
+        # Signature check runs every time; it is a cheap HMAC over the raw token
+        jwt.api_jws.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = _decode_unverified(token)
     except jwt.PyJWTError:
         raise credentials_exception
+    
+    expires_at = payload.get("exp")
+    if expires_at is not None and expires_at <= time.time():
+        raise credentials_exception
+    
+    username: str = payload.get("sub")
+    if username is None:
+        raise credentials_exception
+    token_data = TokenData(username=username)
     user = get_user(fake_users_db, username=token_data.username)
     if user is None:
         raise credentials_exception
@@ -107,8 +137,14 @@ async def get_current_active_user(current_user: User = Depends(get_current_user)
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
+@functools.lru_cache(maxsize=64)
 def has_permission(permission: str):
-    """Check if user has specific permission"""
+    """
+    Check if user has specific permission
+    
+    Memoized so each permission maps to a single dependency callable,
+    letting FastAPI's per-request dependency cache deduplicate checks.
+    """
     def permission_checker(current_user: User = Depends(get_current_active_user)):
         if permission not in current_user.permissions:
             raise HTTPException(
@@ -0,0 +1,56 @@
+# api/dependencies.py
+"""
+Shared FastAPI dependencies for application-wide services.
+"""
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy.orm import Session
+
+from core.compliance.engine import ComplianceEngine
+from core.compliance.policy import PolicyManager
+from models.db import get_db
+from models.resource import ResourceModel
+from models.workflow import WorkflowModel
+
+def get_compliance_engine(request: Request) -> ComplianceEngine:
+    """Get the compliance engine created at application startup"""
+    return request.app.state.compliance_engine
+
+def get_policy_manager(request: Request) -> PolicyManager:
+    """Get the policy manager created at application startup"""
+    return request.app.state.policy_manager
+
+def valid_workflow_id(workflow_id: int, db: Session = Depends(get_db)) -> WorkflowModel:
+    """
+    Load the workflow named in the path, or 404
+    
+    Args:
+        workflow_id: Workflow ID
+        db: Database session
+        
+    Returns:
+        Workflow model
+    """
+    workflow = db.get(WorkflowModel, workflow_id)
+    
+    if not workflow:
+        raise HTTPException(status_code=404, detail="Workflow not found")
+    
+    return workflow
+
+def valid_resource_id(resource_id: str, db: Session = Depends(get_db)) -> ResourceModel:
+    """
+    Load the resource named in the path, or 404
+    
+    Args:
+        resource_id: Resource ID
+        db: Database session
+        
+    Returns:
+        Resource model
+    """
+    resource = db.query(ResourceModel).filter(ResourceModel.resource_id == resource_id).first()
+    
+    if not resource:
+        raise HTTPException(status_code=404, detail="Resource not found")
+    
+    return resource
\ No newline at end of file
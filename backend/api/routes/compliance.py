@@ -1,74 +1,71 @@
 # api/routes/compliance.py
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import Float, cast, func
 from sqlalchemy.orm import Session
 from typing import Dict, List, Optional
 from datetime import datetime
 
 from models.db import get_db
-from models.resource import ResourceModel, ComplianceStatus
-from core.compliance.engine import ComplianceEngine
+from models.resource import ResourceModel, ComplianceStatus, CloudProvider
+from core.queue import enqueue_scan, enqueue_evaluation, get_job_status, get_queue_depths
 
 router = APIRouter()
-compliance_engine = ComplianceEngine()
 
 @router.get("/scan")
-async def scan_resources(
-    cloud_provider: Optional[str] = None, 
-    background_tasks: BackgroundTasks = None,
-    db: Session = Depends(get_db)
-):
+def scan_resources(cloud_provider: Optional[CloudProvider] = None):
     """
     Scan cloud resources for compliance
     
+    The scan runs on the background worker; poll /jobs/{job_id} until it has
+    dispatched the scan, then /jobs/{scan_id} from its result for the totals.
+    
     Args:
         cloud_provider: Optional cloud provider to scan (aws, azure, gcp)
-        background_tasks: FastAPI background tasks
-        db: Database session
         
     Returns:
-        Dict with scan status
+        Dict with scan status and job ID
     """
-    if background_tasks:
-        # Run scan in background
-        background_tasks.add_task(compliance_engine.scan_resources, cloud_provider)
-        return {"status": "success", "message": "Scan started in background"}
-    else:
-        # Run scan immediately
-        resources = compliance_engine.scan_resources(cloud_provider)
-        return {
-            "status": "success", 
-            "message": f"Scanned {len(resources)} resources"
-        }
+    job_id = enqueue_scan(cloud_provider)
+    return {"status": "success", "message": "Scan queued", "job_id": job_id}
 
 @router.get("/evaluate")
-async def evaluate_compliance(
-    background_tasks: BackgroundTasks = None,
-    db: Session = Depends(get_db)
-):
+def evaluate_compliance():
     """
     Evaluate compliance for all resources
     
+    The evaluation runs on the background worker; poll /jobs/{job_id} for its result.
+    
+    Returns:
+        Dict with evaluation status and job ID
+    """
+    job_id = enqueue_evaluation()
+    return {"status": "success", "message": "Evaluation queued", "job_id": job_id}
+
+@router.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    """
+    Get the state of a queued scan or evaluation
+    
     Args:
-        background_tasks: FastAPI background tasks
-        db: Database session
+        job_id: Job ID returned by /scan or /evaluate
         
     Returns:
-        Dict with evaluation status
+        Dict with job state and, once finished, its result
     """
-    if background_tasks:
-        # Run evaluation in background
-        background_tasks.add_task(compliance_engine.evaluate_all_resources)
-        return {"status": "success", "message": "Evaluation started in background"}
-    else:
-        # Run evaluation immediately
-        results = compliance_engine.evaluate_all_resources()
-        return {
-            "status": "success",
-            "results": results
-        }
+    return get_job_status(job_id)
+
+@router.get("/queues")
+def get_queues():
+    """
+    Get the number of jobs waiting in each worker queue
+    
+    Returns:
+        Dict mapping queue name (scan, eval, remediate) to waiting jobs
+    """
+    return get_queue_depths()
 
 @router.get("/status")
-async def get_compliance_status(db: Session = Depends(get_db)):
+def get_compliance_status(db: Session = Depends(get_db)):
     """
     Get overall compliance status
     
@@ -78,17 +75,19 @@ async def get_compliance_status(db: Session = Depends(get_db)):
     Returns:
         Dict with compliance statistics
     """
-    total = db.query(ResourceModel).count()
-    compliant = db.query(ResourceModel).filter(ResourceModel.compliance_status == ComplianceStatus.COMPLIANT).count()
-    non_compliant = db.query(ResourceModel).filter(ResourceModel.compliance_status == ComplianceStatus.NON_COMPLIANT).count()
-    unknown = db.query(ResourceModel).filter(ResourceModel.compliance_status == ComplianceStatus.UNKNOWN).count()
-    exempt = db.query(ResourceModel).filter(ResourceModel.compliance_status == ComplianceStatus.EXEMPT).count()
+    def count_status(status: ComplianceStatus):
+        return func.count().filter(ResourceModel.compliance_status == status)
+    
+    compliant = count_status(ComplianceStatus.COMPLIANT)
+    row = db.query(
+        func.count().label("total_resources"),
+        compliant.label("compliant"),
+        count_status(ComplianceStatus.NON_COMPLIANT).label("non_compliant"),
+        count_status(ComplianceStatus.UNKNOWN).label("unknown"),
+        count_status(ComplianceStatus.EXEMPT).label("exempt"),
+        func.coalesce(
+            cast(compliant, Float) / func.nullif(func.count(), 0) * 100, 0
+        ).label("compliance_rate")
+    ).one()
     
-    return {
-        "total_resources": total,
-        "compliant": compliant,
-        "non_compliant": non_compliant,
-        "unknown": unknown,
-        "exempt": exempt,
-        "compliance_rate": (compliant / total) * 100 if total > 0 else 0
-    }
\ No newline at end of file
+    return dict(row._mapping)
\ No newline at end of file
@@ -7,9 +7,9 @@ from pydantic import BaseModel
 from models.db import get_db
 from models.policy import PolicyModel, Policy
 from core.compliance.policy import PolicyManager
+from api.dependencies import get_policy_manager
 
 router = APIRouter()
-policy_manager = PolicyManager()
 
 class TagRule(BaseModel):
     name: str
@@ -34,13 +34,18 @@ class PolicyUpdate(BaseModel):
     cloud_providers: Optional[List[str]] = None
 
 @router.post("/")
-async def create_policy(policy: PolicyCreate, db: Session = Depends(get_db)):
+def create_policy(
+    policy: PolicyCreate,
+    db: Session = Depends(get_db),
+    policy_manager: PolicyManager = Depends(get_policy_manager)
+):
     """
     Create a new compliance policy
     
     Args:
         policy: Policy data
         db: Database session
+        policy_manager: Shared policy manager
         
     Returns:
         Created policy
@@ -52,11 +57,12 @@ async def create_policy(policy: PolicyCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/")
-async def list_policies(
+def list_policies(
     active_only: bool = False,
     skip: int = 0, 
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    policy_manager: PolicyManager = Depends(get_policy_manager)
 ):
     """
     List compliance policies
@@ -66,23 +72,26 @@ async def list_policies(
         skip: Number of records to skip (pagination)
         limit: Maximum number of records to return
         db: Database session
+        policy_manager: Shared policy manager
         
     Returns:
         List of policies
     """
-    policies = policy_manager.get_policies(active_only)
-    
-    # Apply pagination
-    return policies[skip:skip + limit]
+    return policy_manager.get_policies(active_only, skip=skip, limit=limit)
 
 @router.get("/{policy_id}")
-async def get_policy(policy_id: int, db: Session = Depends(get_db)):
+def get_policy(
+    policy_id: int,
+    db: Session = Depends(get_db),
+    policy_manager: PolicyManager = Depends(get_policy_manager)
+):
     """
     Get a specific compliance policy
     
     Args:
         policy_id: Policy ID
         db: Database session
+        policy_manager: Shared policy manager
         
     Returns:
         Policy
@@ -95,10 +104,11 @@ async def get_policy(policy_id: int, db: Session = Depends(get_db)):
     return policy
 
 @router.put("/{policy_id}")
-async def update_policy(
+def update_policy(
     policy_id: int,
     policy_update: PolicyUpdate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    policy_manager: PolicyManager = Depends(get_policy_manager)
 ):
     """
     Update a compliance policy
@@ -107,6 +117,7 @@ async def update_policy(
         policy_id: Policy ID
         policy_update: Policy update data
         db: Database session
+        policy_manager: Shared policy manager
         
     Returns:
         Updated policy
@@ -122,13 +133,18 @@ async def update_policy(
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.delete("/{policy_id}")
-async def delete_policy(policy_id: int, db: Session = Depends(get_db)):
+def delete_policy(
+    policy_id: int,
+    db: Session = Depends(get_db),
+    policy_manager: PolicyManager = Depends(get_policy_manager)
+):
     """
     Delete a compliance policy
     
     Args:
         policy_id: Policy ID
         db: Database session
+        policy_manager: Shared policy manager
         
     Returns:
         Deletion status
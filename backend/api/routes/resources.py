@@ -1,19 +1,33 @@
 # api/routes/resources.py
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import bindparam, func, select, text
 from sqlalchemy.orm import Session
 from typing import Dict, List, Optional
 from datetime import datetime
 
 from models.db import get_db
-from models.resource import ResourceModel, Resource, ComplianceStatus
+from models.resource import ResourceModel, Resource, ComplianceStatus, CloudProvider
+from core.cache import resource_list_cache
+from core.queue import get_resource_list_generation
+from api.dependencies import valid_resource_id
 
 router = APIRouter()
 
+# Missing-tag counts aggregated in PostgreSQL from compliance_details JSONB
+_MISSING_TAG_COUNTS = text("""
+    SELECT missing_tag->>'tag_name' AS tag_name, COUNT(*) AS issue_count
+    FROM resources,
+         jsonb_array_elements(compliance_details->'missing_tags') AS missing_tag
+    WHERE compliance_status = :status
+    GROUP BY tag_name
+""").bindparams(bindparam("status", type_=ResourceModel.compliance_status.type))
+
 @router.get("/")
-async def list_resources(
-    cloud_provider: Optional[str] = None,
+def list_resources(
+    cloud_provider: Optional[CloudProvider] = None,
     resource_type: Optional[str] = None,
-    compliance_status: Optional[str] = None,
+    compliance_status: Optional[ComplianceStatus] = None,
     region: Optional[str] = None,
     has_tag: Optional[str] = None,
     skip: int = 0,
@@ -36,6 +50,15 @@ async def list_resources(
     Returns:
         List of resources
     """
+    # Dashboards poll identical filter combinations; serve them from cache until the
+    # worker next writes resources and bumps the generation
+    generation = get_resource_list_generation()
+    cache_key = (generation, cloud_provider, resource_type, compliance_status, region, has_tag, skip, limit)
+    if generation is not None:
+        cached = resource_list_cache.get(cache_key)
+        if cached is not None:
+            return ORJSONResponse(cached)
+    
     query = db.query(ResourceModel)
     
     # Apply filters
@@ -46,11 +69,7 @@ async def list_resources(
         query = query.filter(ResourceModel.resource_type == resource_type)
     
     if compliance_status:
-        try:
-            status = ComplianceStatus(compliance_status)
-            query = query.filter(ResourceModel.compliance_status == status)
-        except ValueError:
-            raise HTTPException(status_code=400, detail=f"Invalid compliance status: {compliance_status}")
+        query = query.filter(ResourceModel.compliance_status == compliance_status)
     
     if region:
         query = query.filter(ResourceModel.region == region)
@@ -61,29 +80,13 @@ async def list_resources(
         query = query.filter(ResourceModel.tags.has_key(has_tag))
     
     resources = query.offset(skip).limit(limit).all()
-    return [Resource.from_model(r) for r in resources]
-
-@router.get("/{resource_id}")
-async def get_resource(resource_id: str, db: Session = Depends(get_db)):
-    """
-    Get a specific resource by ID
-    
-    Args:
-        resource_id: Resource ID
-        db: Database session
-        
-    Returns:
-        Resource details
-    """
-    resource = db.query(ResourceModel).filter(ResourceModel.resource_id == resource_id).first()
-    
-    if not resource:
-        raise HTTPException(status_code=404, detail="Resource not found")
-    
-    return Resource.from_model(resource)
+    result = [Resource.dict_from_model(r) for r in resources]
+    if generation is not None:
+        resource_list_cache.set(cache_key, result)
+    return ORJSONResponse(result)
 
 @router.get("/stats")
-async def get_resource_stats(db: Session = Depends(get_db)):
+def get_resource_stats(db: Session = Depends(get_db)):
     """
     Get resource statistics
     
@@ -94,41 +97,35 @@ async def get_resource_stats(db: Session = Depends(get_db)):
         Resource statistics
     """
     # Count by cloud provider
-    provider_counts = {}
-    for provider in ["aws", "azure", "gcp"]:
-        count = db.query(ResourceModel).filter(ResourceModel.cloud_provider == provider).count()
-        provider_counts[provider] = count
+    provider_rows = dict(
+        db.query(ResourceModel.cloud_provider, func.count())
+        .group_by(ResourceModel.cloud_provider)
+        .all()
+    )
+    provider_counts = {provider: provider_rows.get(provider, 0) for provider in ["aws", "azure", "gcp"]}
     
     # Count by resource type
-    resource_type_counts = {}
-    resource_types = db.query(ResourceModel.resource_type).distinct().all()
-    for r_type in resource_types:
-        count = db.query(ResourceModel).filter(ResourceModel.resource_type == r_type[0]).count()
-        resource_type_counts[r_type[0]] = count
+    resource_type_counts = dict(
+        db.query(ResourceModel.resource_type, func.count())
+        .group_by(ResourceModel.resource_type)
+        .all()
+    )
     
     # Count by compliance status
-    status_counts = {}
-    for status in ComplianceStatus:
-        count = db.query(ResourceModel).filter(ResourceModel.compliance_status == status).count()
-        status_counts[status.value] = count
+    status_rows = dict(
+        db.query(ResourceModel.compliance_status, func.count())
+        .group_by(ResourceModel.compliance_status)
+        .all()
+    )
+    status_counts = {status.value: status_rows.get(status, 0) for status in ComplianceStatus}
     
     # Most common missing tags
-    missing_tags_stats = {}
-    # This would require custom SQL or complex ORM queries with JSON functions
-    # Simplified approach for demonstration:
-    non_compliant = db.query(ResourceModel).filter(ResourceModel.compliance_status == ComplianceStatus.NON_COMPLIANT).all()
-    tag_issues = {}
-    
-    for resource in non_compliant:
-        if resource.compliance_details and "missing_tags" in resource.compliance_details:
-            for missing_tag in resource.compliance_details["missing_tags"]:
-                tag_name = missing_tag["tag_name"]
-                if tag_name not in tag_issues:
-                    tag_issues[tag_name] = 0
-                tag_issues[tag_name] += 1
+    tag_issues = dict(
+        db.execute(_MISSING_TAG_COUNTS, {"status": ComplianceStatus.NON_COMPLIANT}).all()
+    )
     
     return {
-        "total_resources": db.query(ResourceModel).count(),
+        "total_resources": sum(status_rows.values()),
         "by_provider": provider_counts,
         "by_resource_type": resource_type_counts,
         "by_compliance_status": status_counts,
@@ -136,7 +133,7 @@ async def get_resource_stats(db: Session = Depends(get_db)):
     }
 
 @router.get("/types")
-async def get_resource_types(db: Session = Depends(get_db)):
+def get_resource_types(db: Session = Depends(get_db)):
     """
     Get list of available resource types
     
@@ -146,12 +143,11 @@ async def get_resource_types(db: Session = Depends(get_db)):
     Returns:
         List of resource types
     """
-    resource_types = db.query(ResourceModel.resource_type).distinct().all()
-    return [r_type[0] for r_type in resource_types]
+    return db.execute(select(ResourceModel.resource_type).distinct()).scalars().all()
 
 @router.get("/regions")
-async def get_regions(
-    cloud_provider: Optional[str] = None,
+def get_regions(
+    cloud_provider: Optional[CloudProvider] = None,
     db: Session = Depends(get_db)
 ):
     """
@@ -164,10 +160,22 @@ async def get_regions(
     Returns:
         List of regions
     """
-    query = db.query(ResourceModel.region).distinct()
+    query = select(ResourceModel.region).distinct()
     
     if cloud_provider:
-        query = query.filter(ResourceModel.cloud_provider == cloud_provider)
+        query = query.where(ResourceModel.cloud_provider == cloud_provider)
+    
+    return db.execute(query).scalars().all()
+
+@router.get("/{resource_id}")
+def get_resource(resource: ResourceModel = Depends(valid_resource_id)):
+    """
+    Get a specific resource by ID
+    
+    Args:
+        resource: Resource loaded from the path ID
         
-    regions = query.all()
-    return [region[0] for region in regions]
\ No newline at end of file
+    Returns:
+        Resource details
+    """
+    return Resource.dict_from_model(resource)
\ No newline at end of file
@@ -1,5 +1,8 @@
 # api/routes/workflows.py
 from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import func, insert, literal, update
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Session
 from typing import Dict, List, Optional
 from pydantic import BaseModel
@@ -7,19 +10,19 @@ from datetime import datetime
 
 from models.db import get_db
 from models.workflow import WorkflowModel, Workflow, WorkflowStatus, WorkflowType
-from core.compliance.engine import ComplianceEngine
+from core.queue import enqueue_remediation, enqueue_remediation_batch
+from api.dependencies import valid_workflow_id
 
 router = APIRouter()
-compliance_engine = ComplianceEngine()
 
 class WorkflowCreate(BaseModel):
     resource_id: str
-    workflow_type: str
+    workflow_type: WorkflowType
     details: Optional[Dict] = None
     created_by: Optional[str] = None
 
 class WorkflowUpdate(BaseModel):
-    status: Optional[str] = None
+    status: Optional[WorkflowStatus] = None
     approved_by: Optional[str] = None
     details: Optional[Dict] = None
 
@@ -27,12 +30,42 @@ class RemediationApproval(BaseModel):
     approved_tags: Dict[str, str]
     approved_by: Optional[str] = None
 
+class WorkflowTagApproval(BaseModel):
+    workflow_id: int
+    approved_tags: Dict[str, str]
+
+class RemediationBatchApproval(BaseModel):
+    approvals: List[WorkflowTagApproval]
+    approved_by: Optional[str] = None
+
 class RemediationRejection(BaseModel):
     reason: str
     rejected_by: Optional[str] = None
 
+def _workflow_values(workflow: WorkflowCreate) -> Dict:
+    """Build insert values for a new pending workflow"""
+    return {
+        "resource_id": workflow.resource_id,
+        "workflow_type": workflow.workflow_type,
+        "status": WorkflowStatus.PENDING,
+        "details": workflow.details,
+        "created_by": workflow.created_by
+    }
+
+def _insert_workflows(db: Session, values: List[Dict]) -> List[Workflow]:
+    """Insert workflows in one statement, returning the stored rows"""
+    stmt = (
+        insert(WorkflowModel)
+        .values(values)
+        .returning(*WorkflowModel.__table__.columns)
+    )
+    rows = db.execute(stmt).all()
+    db.commit()
+    
+    return [Workflow.from_model(row) for row in rows]
+
 @router.post("/")
-async def create_workflow(workflow: WorkflowCreate, db: Session = Depends(get_db)):
+def create_workflow(workflow: WorkflowCreate, db: Session = Depends(get_db)):
     """
     Create a new workflow
     
@@ -43,29 +76,29 @@ async def create_workflow(workflow: WorkflowCreate, db: Session = Depends(get_db
     Returns:
         Created workflow
     """
-    try:
-        workflow_type = WorkflowType(workflow.workflow_type)
-    except ValueError:
-        raise HTTPException(status_code=400, detail=f"Invalid workflow type: {workflow.workflow_type}")
-    
-    db_workflow = WorkflowModel(
-        resource_id=workflow.resource_id,
-        workflow_type=workflow_type,
-        status=WorkflowStatus.PENDING,
-        details=workflow.details,
-        created_by=workflow.created_by
-    )
+    return _insert_workflows(db, [_workflow_values(workflow)])[0]
+
+@router.post("/batch")
+def create_workflows(workflows: List[WorkflowCreate], db: Session = Depends(get_db)):
+    """
+    Create multiple workflows in a single statement
     
-    db.add(db_workflow)
-    db.commit()
-    db.refresh(db_workflow)
+    Args:
+        workflows: List of workflow data
+        db: Database session
+        
+    Returns:
+        List of created workflows
+    """
+    if not workflows:
+        return []
     
-    return Workflow.from_model(db_workflow)
+    return _insert_workflows(db, [_workflow_values(w) for w in workflows])
 
 @router.get("/")
-async def list_workflows(
-    status: Optional[str] = None,
-    workflow_type: Optional[str] = None,
+def list_workflows(
+    status: Optional[WorkflowStatus] = None,
+    workflow_type: Optional[WorkflowType] = None,
     resource_id: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
@@ -89,210 +122,309 @@ async def list_workflows(
     
     # Apply filters
     if status:
-        try:
-            status_enum = WorkflowStatus(status)
-            query = query.filter(WorkflowModel.status == status_enum)
-        except ValueError:
-            raise HTTPException(status_code=400, detail=f"Invalid workflow status: {status}")
+        query = query.filter(WorkflowModel.status == status)
     
     if workflow_type:
-        try:
-            type_enum = WorkflowType(workflow_type)
-            query = query.filter(WorkflowModel.workflow_type == type_enum)
-        except ValueError:
-            raise HTTPException(status_code=400, detail=f"Invalid workflow type: {workflow_type}")
+        query = query.filter(WorkflowModel.workflow_type == workflow_type)
     
     if resource_id:
         query = query.filter(WorkflowModel.resource_id == resource_id)
     
-    workflows = query.offset(skip).limit(limit).all()
-    return [Workflow.from_model(w) for w in workflows]
+    workflows = query.order_by(WorkflowModel.created_at.desc()).offset(skip).limit(limit).all()
+    return ORJSONResponse([Workflow.dict_from_model(w) for w in workflows])
 
-@router.get("/{workflow_id}")
-async def get_workflow(workflow_id: int, db: Session = Depends(get_db)):
+@router.get("/stats")
+def get_workflow_stats(db: Session = Depends(get_db)):
     """
-    Get a specific workflow
+    Get workflow statistics
     
     Args:
-        workflow_id: Workflow ID
         db: Database session
         
     Returns:
-        Workflow details
+        Workflow statistics
     """
-    workflow = db.query(WorkflowModel).filter(WorkflowModel.id == workflow_id).first()
+    # Count by status
+    status_rows = dict(
+        db.query(WorkflowModel.status, func.count())
+        .group_by(WorkflowModel.status)
+        .all()
+    )
+    status_counts = {status.value: status_rows.get(status, 0) for status in WorkflowStatus}
     
-    if not workflow:
-        raise HTTPException(status_code=404, detail="Workflow not found")
+    # Count by type
+    type_rows = dict(
+        db.query(WorkflowModel.workflow_type, func.count())
+        .group_by(WorkflowModel.workflow_type)
+        .all()
+    )
+    type_counts = {w_type.value: type_rows.get(w_type, 0) for w_type in WorkflowType}
     
+    # Recent workflows
+    recent_limit = 5
+    recent_workflows = (
+        db.query(WorkflowModel)
+        .order_by(WorkflowModel.created_at.desc())
+        .limit(recent_limit)
+        .all()
+    )
+    
+    return {
+        "total_workflows": sum(status_rows.values()),
+        "by_status": status_counts,
+        "by_type": type_counts,
+        "recent_workflows": [Workflow.from_model(w) for w in recent_workflows]
+    }
+
+@router.get("/{workflow_id}")
+def get_workflow(workflow: WorkflowModel = Depends(valid_workflow_id)):
+    """
+    Get a specific workflow
+    
+    Args:
+        workflow: Workflow loaded from the path ID
+        
+    Returns:
+        Workflow details
+    """
     return Workflow.from_model(workflow)
 
 @router.put("/{workflow_id}")
-async def update_workflow(
-    workflow_id: int,
+def update_workflow(
     workflow_update: WorkflowUpdate,
+    db_workflow: WorkflowModel = Depends(valid_workflow_id),
     db: Session = Depends(get_db)
 ):
     """
     Update a workflow
     
     Args:
-        workflow_id: Workflow ID
         workflow_update: Workflow update data
+        db_workflow: Workflow loaded from the path ID
         db: Database session
         
     Returns:
         Updated workflow
     """
-    db_workflow = db.query(WorkflowModel).filter(WorkflowModel.id == workflow_id).first()
-    
-    if not db_workflow:
-        raise HTTPException(status_code=404, detail="Workflow not found")
-    
     # Handle status update
     if workflow_update.status:
-        try:
-            status_enum = WorkflowStatus(workflow_update.status)
-            db_workflow.status = status_enum
-        except ValueError:
-            raise HTTPException(status_code=400, detail=f"Invalid workflow status: {workflow_update.status}")
+        db_workflow.status = workflow_update.status
     
     # Update other fields if provided
     if workflow_update.approved_by:
         db_workflow.approved_by = workflow_update.approved_by
     
     if workflow_update.details:
-        # Update details, preserving existing keys
-        updated_details = db_workflow.details or {}
-        updated_details.update(workflow_update.details)
-        db_workflow.details = updated_details
+        # Update details, preserving existing keys; assign a new dict so the change is persisted
+        db_workflow.details = {**(db_workflow.details or {}), **workflow_update.details}
     
     db.commit()
     db.refresh(db_workflow)
     
     return Workflow.from_model(db_workflow)
 
-@router.post("/{workflow_id}/approve")
-async def approve_remediation(
-    workflow_id: int,
-    approval: RemediationApproval,
-    db: Session = Depends(get_db)
-):
+def _claim_pending_remediation(db: Session, workflow_id: int, **values) -> None:
     """
-    Approve and execute a remediation workflow
+    Move a pending remediation workflow to a new state in a single guarded UPDATE
     
     Args:
+        db: Database session
         workflow_id: Workflow ID
-        approval: Approval data with tags
+        **values: Column values to set on the workflow
+        
+    Raises:
+        HTTPException: 404 if the workflow does not exist, 400 if it is not a
+            pending remediation workflow
+    """
+    claimed = db.execute(
+        update(WorkflowModel)
+        .where(
+            WorkflowModel.id == workflow_id,
+            WorkflowModel.status == WorkflowStatus.PENDING,
+            WorkflowModel.workflow_type == WorkflowType.REMEDIATION
+        )
+        .values(**values)
+        .returning(WorkflowModel.id)
+        .execution_options(synchronize_session=False)
+    ).first()
+    
+    if claimed is None:
+        db.rollback()
+        
+        # Only the failure path needs to know why the guard did not match
+        db_workflow = db.get(WorkflowModel, workflow_id)
+        
+        if not db_workflow:
+            raise HTTPException(status_code=404, detail="Workflow not found")
+        
+        if db_workflow.workflow_type != WorkflowType.REMEDIATION:
+            raise HTTPException(status_code=400, detail="Workflow is not a remediation workflow")
+        
+        raise HTTPException(status_code=400, detail="Workflow is not in pending status")
+    
+    db.commit()
+
+def _claim_pending_remediations(db: Session, workflow_ids: List[int], **values) -> List[int]:
+    """
+    Move every pending remediation workflow among workflow_ids to a new state in one UPDATE
+    
+    Args:
         db: Database session
+        workflow_ids: Workflow IDs
+        **values: Column values to set on the workflows
         
     Returns:
-        Approval status
+        IDs of the workflows that were pending remediations and are now claimed
     """
-    db_workflow = db.query(WorkflowModel).filter(WorkflowModel.id == workflow_id).first()
+    claimed = db.execute(
+        update(WorkflowModel)
+        .where(
+            WorkflowModel.id.in_(workflow_ids),
+            WorkflowModel.status == WorkflowStatus.PENDING,
+            WorkflowModel.workflow_type == WorkflowType.REMEDIATION
+        )
+        .values(**values)
+        .returning(WorkflowModel.id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    db.commit()
     
-    if not db_workflow:
-        raise HTTPException(status_code=404, detail="Workflow not found")
+    return claimed
+
+def _release_remediation(db: Session, workflow_ids: List[int], claimed_status: WorkflowStatus) -> None:
+    """Return claimed remediation workflows to PENDING after a failed action"""
+    db.execute(
+        update(WorkflowModel)
+        .where(WorkflowModel.id.in_(workflow_ids), WorkflowModel.status == claimed_status)
+        .values(status=WorkflowStatus.PENDING, approved_by=None, completed_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+@router.post("/batch/approve")
+def approve_remediations(
+    batch: RemediationBatchApproval,
+    db: Session = Depends(get_db)
+):
+    """
+    Approve several remediation workflows and queue them on the worker
     
-    if db_workflow.workflow_type != WorkflowType.REMEDIATION:
-        raise HTTPException(status_code=400, detail="Workflow is not a remediation workflow")
+    Workflows that are not pending remediations are skipped. The worker applies the
+    rest and returns any it could not apply to pending; poll
+    /api/compliance/jobs/{job_id} for the applied and failed IDs.
     
-    if db_workflow.status != WorkflowStatus.PENDING:
-        raise HTTPException(status_code=400, detail="Workflow is not in pending status")
+    Args:
+        batch: Tags to apply per workflow and the approver
+        db: Database session
+        
+    Returns:
+        IDs of the queued and skipped workflows, and the job ID
+    """
+    approvals = {approval.workflow_id: approval.approved_tags for approval in batch.approvals}
+    if not approvals:
+        return {"status": "success", "queued": [], "skipped": [], "job_id": None}
+    
+    claimed = _claim_pending_remediations(
+        db,
+        list(approvals),
+        status=WorkflowStatus.APPROVED,
+        approved_by=batch.approved_by
+    )
+    if not claimed:
+        return {"status": "success", "queued": [], "skipped": list(approvals), "job_id": None}
     
-    # Apply the remediation
+    # Queue the remediations; hand the workflows back to PENDING if they cannot be queued
     try:
-        success = compliance_engine.approve_remediation(workflow_id, approval.approved_tags)
-        
-        if not success:
-            raise HTTPException(status_code=500, detail="Failed to apply remediation")
-        
-        return {
-            "status": "success",
-            "message": "Remediation approved and applied",
-            "workflow_id": workflow_id
-        }
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+        job_id = enqueue_remediation_batch(
+            {workflow_id: approvals[workflow_id] for workflow_id in claimed},
+            batch.approved_by
+        )
+    except Exception:
+        _release_remediation(db, claimed, WorkflowStatus.APPROVED)
+        raise HTTPException(status_code=503, detail="Could not queue remediations")
+    
+    claimed_set = set(claimed)
+    return {
+        "status": "success",
+        "queued": claimed,
+        "skipped": [workflow_id for workflow_id in approvals if workflow_id not in claimed_set],
+        "job_id": job_id
+    }
 
-@router.post("/{workflow_id}/reject")
-async def reject_remediation(
+@router.post("/{workflow_id}/approve")
+def approve_remediation(
     workflow_id: int,
-    rejection: RemediationRejection,
+    approval: RemediationApproval,
     db: Session = Depends(get_db)
 ):
     """
-    Reject a remediation workflow
+    Approve a remediation workflow and queue it on the worker
+    
+    The worker applies the tags and completes the workflow, or returns it to pending
+    if they cannot be applied; poll /api/compliance/jobs/{job_id} for the outcome.
     
     Args:
         workflow_id: Workflow ID
-        rejection: Rejection data with reason
+        approval: Approval data with tags
         db: Database session
         
     Returns:
-        Rejection status
+        Approval status and job ID
     """
-    db_workflow = db.query(WorkflowModel).filter(WorkflowModel.id == workflow_id).first()
-    
-    if not db_workflow:
-        raise HTTPException(status_code=404, detail="Workflow not found")
-    
-    if db_workflow.workflow_type != WorkflowType.REMEDIATION:
-        raise HTTPException(status_code=400, detail="Workflow is not a remediation workflow")
-    
-    if db_workflow.status != WorkflowStatus.PENDING:
-        raise HTTPException(status_code=400, detail="Workflow is not in pending status")
+    _claim_pending_remediation(
+        db,
+        workflow_id,
+        status=WorkflowStatus.APPROVED,
+        approved_by=approval.approved_by
+    )
     
-    # Reject the remediation
+    # Queue the remediation; hand the workflow back to PENDING if it cannot be queued
     try:
-        success = compliance_engine.reject_remediation(workflow_id, rejection.reason)
-        
-        if not success:
-            raise HTTPException(status_code=500, detail="Failed to reject remediation")
-        
-        return {
-            "status": "success",
-            "message": "Remediation rejected",
-            "workflow_id": workflow_id
-        }
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+        job_id = enqueue_remediation(workflow_id, approval.approved_tags, approval.approved_by)
+    except Exception:
+        _release_remediation(db, [workflow_id], WorkflowStatus.APPROVED)
+        raise HTTPException(status_code=503, detail="Could not queue remediation")
+    
+    return {
+        "status": "success",
+        "message": "Remediation approved and queued",
+        "workflow_id": workflow_id,
+        "job_id": job_id
+    }
 
-@router.get("/stats")
-async def get_workflow_stats(db: Session = Depends(get_db)):
+@router.post("/{workflow_id}/reject")
+def reject_remediation(
+    workflow_id: int,
+    rejection: RemediationRejection,
+    db: Session = Depends(get_db)
+):
     """
-    Get workflow statistics
+    Reject a remediation workflow
+    
+    The status change and the rejection reason are written by one guarded UPDATE,
+    so a workflow is never left rejected without its reason.
     
     Args:
+        workflow_id: Workflow ID
+        rejection: Rejection data with reason
         db: Database session
         
     Returns:
-        Workflow statistics
+        Rejection status
     """
-    # Count by status
-    status_counts = {}
-    for status in WorkflowStatus:
-        count = db.query(WorkflowModel).filter(WorkflowModel.status == status).count()
-        status_counts[status.value] = count
-    
-    # Count by type
-    type_counts = {}
-    for w_type in WorkflowType:
-        count = db.query(WorkflowModel).filter(WorkflowModel.workflow_type == w_type).count()
-        type_counts[w_type.value] = count
-    
-    # Recent workflows
-    recent_limit = 5
-    recent_workflows = (
-        db.query(WorkflowModel)
-        .order_by(WorkflowModel.created_at.desc())
-        .limit(recent_limit)
-        .all()
+    _claim_pending_remediation(
+        db,
+        workflow_id,
+        status=WorkflowStatus.REJECTED,
+        completed_at=datetime.utcnow(),
+        # Merge the reason into the stored details server-side
+        details=func.coalesce(WorkflowModel.details, literal({}, JSONB)).op("||")(
+            literal({"rejection_reason": rejection.reason}, JSONB)
+        )
     )
     
     return {
-        "total_workflows": db.query(WorkflowModel).count(),
-        "by_status": status_counts,
-        "by_type": type_counts,
-        "recent_workflows": [Workflow.from_model(w) for w in recent_workflows]
+        "status": "success",
+        "message": "Remediation rejected",
+        "workflow_id": workflow_id
     }
\ No newline at end of file
@@ -4,11 +4,14 @@ Main application entry point for the Cloud Resource Tagging Compliance API.
 """
 from fastapi import FastAPI, Depends, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 import uvicorn
 import logging
 import os
 
 from api.routes import compliance, policies, resources, workflows
+from core.compliance.engine import ComplianceEngine
+from core.compliance.policy import PolicyManager
 from models.db import get_db, init_db
 
 # Configure logging
@@ -22,7 +25,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Cloud Resource Tagging Compliance API",
     description="API for managing cloud resource tagging compliance across multiple cloud providers.",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -33,10 +37,17 @@ origins = [
 ]
 
 if os.getenv("CORS_ORIGINS"):
-    origins.extend(os.getenv("CORS_ORIGINS").split(","))
+    origins.extend(origin.strip() for origin in os.getenv("CORS_ORIGINS").split(",") if origin.strip())
+
+class SetCORSMiddleware(CORSMiddleware):
+    """CORSMiddleware that checks request origins against a set instead of a list"""
+    
+    def __init__(self, app, allow_origins=(), **kwargs):
+        super().__init__(app, allow_origins=allow_origins, **kwargs)
+        self.allow_origins = frozenset(allow_origins)
 
 app.add_middleware(
-    CORSMiddleware,
+    SetCORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=["*"],
@@ -55,6 +66,11 @@ def startup_event():
     logger.info("Starting application")
     init_db()
     logger.info("Database initialized")
+    
+    # Build shared services once so their setup cost is paid at boot
+    app.state.compliance_engine = ComplianceEngine()
+    app.state.policy_manager = PolicyManager()
+    logger.info("Compliance services initialized")
 
 @app.get("/health", tags=["Health"])
 def health_check():
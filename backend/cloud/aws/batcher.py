@@ -0,0 +1,81 @@
+# cloud/aws/batcher.py
+"""
+Coalesces concurrent single-item requests into batched AWS API calls.
+"""
+import threading
+from typing import Any, Callable, Dict, Hashable, List
+
+class _Batch:
+    """Items waiting to be sent together, and the outcome once they are"""
+    
+    def __init__(self):
+        self.items: List[Any] = []
+        self.done = threading.Event()
+        self.result: Any = None
+
+class Batcher:
+    """
+    Groups items added under the same key and executes each group with one call
+    
+    A group is executed once it reaches max_batch_size items or max_delay seconds
+    after its first item was added, whichever comes first. Callers block in add()
+    until their group has been executed and receive the shared result.
+    
+    Args:
+        execute: Function called with (key, items) for each batch; its return value
+            is handed to every caller in the batch
+        max_delay: Seconds to wait for more items before executing a batch
+        max_batch_size: Most items sent in a single call
+    """
+    
+    def __init__(
+        self,
+        execute: Callable[[Hashable, List[Any]], Any],
+        max_delay: float = 0.3,
+        max_batch_size: int = 1000
+    ):
+        self.execute = execute
+        self.max_delay = max_delay
+        self.max_batch_size = max_batch_size
+        self._pending: Dict[Hashable, _Batch] = {}
+        self._lock = threading.Lock()
+    
+    def add(self, key: Hashable, item: Any) -> Any:
+        """
+        Add an item to the open batch for key and wait for that batch to run
+        
+        Args:
+            key: Items with equal keys are sent together
+            item: Item to include in the batch
+        
+        Returns:
+            Result of the execute call for the batch
+        """
+        with self._lock:
+            batch = self._pending.get(key)
+            if batch is None:
+                batch = self._pending[key] = _Batch()
+                timer = threading.Timer(self.max_delay, self._flush, args=(key, batch))
+                timer.daemon = True
+                timer.start()
+            
+            batch.items.append(item)
+            full = len(batch.items) >= self.max_batch_size
+        
+        if full:
+            self._flush(key, batch)
+        
+        batch.done.wait()
+        return batch.result
+    
+    def _flush(self, key: Hashable, batch: _Batch) -> None:
+        """Execute a batch unless the timer or a full batch already did"""
+        with self._lock:
+            if self._pending.get(key) is not batch:
+                return
+            del self._pending[key]
+        
+        try:
+            batch.result = self.execute(key, batch.items)
+        finally:
+            batch.done.set()
\ No newline at end of file
@@ -1,24 +1,108 @@
 # cloud/aws/connector.py
+import asyncio
 import boto3
 import logging
-from typing import Dict, List, Any, Optional
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Any, Optional, Tuple
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from models.resource import Resource, ComplianceStatus
+from cloud.aws.batcher import Batcher
 
 logger = logging.getLogger(__name__)
 
+# Client-side rate limiting plus backoff so a parallel scan rides out throttling,
+# and a connection pool large enough for the scan's worker threads
+CLIENT_CONFIG = Config(
+    retries={'max_attempts': 10, 'mode': 'adaptive'},
+    max_pool_connections=50
+)
+
+class TagIndex:
+    """
+    Tags for a scan, fetched with one Resource Groups Tagging API sweep per region
+    
+    Fetchers running in parallel for the same region share a single sweep.
+    """
+    
+    def __init__(self, connector: "AWSConnector"):
+        self._connector = connector
+        self._tags_by_region: Dict[str, Optional[Dict[str, Dict[str, str]]]] = {}
+        self._region_locks: Dict[str, threading.Lock] = {}
+    
+    def for_region(self, region: str) -> Optional[Dict[str, Dict[str, str]]]:
+        """
+        Get tags for the region's resources, sweeping the region on first use
+        
+        Returns:
+            Dict mapping resource ARN to its tags, or None if the sweep failed
+        """
+        with self._region_locks.setdefault(region, threading.Lock()):
+            if region not in self._tags_by_region:
+                self._tags_by_region[region] = self._connector._get_tags_by_arn(
+                    region, self._connector.tagging_api_resource_types
+                )
+            return self._tags_by_region[region]
+
 class AWSConnector:
     """Connector for AWS cloud resources"""
     
-    def __init__(self):
+    # Concurrent (region, resource type) fetches during a scan; the work is network-bound
+    max_workers = 32
+    # Types whose tags come from the tagging API; EC2 and RDS describe calls include tags
+    tagging_api_resource_types = ['s3', 'lambda:function']
+    # How long the discovered region list is reused before describe_regions is called again
+    regions_cache_ttl = 3600
+    # Concurrent fetches allowed per service, keeping a scan near each API's refill rate
+    max_concurrent_per_service = 20
+    # CreateTags accepts up to 1000 resource IDs per call
+    ec2_tag_batch_size = 1000
+    # How long a single EC2 tag update waits for others with the same tags to join its call
+    ec2_tag_batch_delay = 0.3
+    # ARN services tagged in bulk through TagResources, which accepts up to 20 ARNs per call;
+    # S3 ARNs carry no region, so buckets keep their own per-bucket call
+    tag_resources_services = ('lambda', 'rds')
+    tag_resources_batch_size = 20
+    
+    def __init__(self, regions: Optional[List[str]] = None):
         self.session = boto3.Session()
+        # Regions to scan: explicit list, then AWS_REGIONS, else every region enabled for the account
+        if regions is None and os.getenv("AWS_REGIONS"):
+            regions = [region.strip() for region in os.getenv("AWS_REGIONS").split(",") if region.strip()]
+        self.regions = regions
+        # (fetched_at, regions) from the last describe_regions call
+        self._regions_cache: Optional[Tuple[float, List[str]]] = None
+        # Clients keyed by (service, region), reused across scans; boto3.Session.client()
+        # is not thread-safe, so creation is serialized
+        self._client_cache: Dict[Tuple[str, Optional[str]], Any] = {}
+        self._client_lock = threading.Lock()
         self.supported_resource_types = {
             'ec2': self._get_ec2_resources,
             's3': self._get_s3_resources,
             'rds': self._get_rds_resources,
             'lambda': self._get_lambda_resources,
         }
+        # Tagging handlers keyed by the service named in the resource ID
+        self._tag_dispatch = {
+            'ec2': self._tag_ec2,
+            's3': self._tag_s3,
+            'rds': self._tag_rds,
+            'lambda': self._tag_lambda,
+        }
+        # Coalesces concurrent single-instance EC2 tag updates into shared CreateTags calls
+        self._ec2_tag_batcher = Batcher(
+            self._execute_ec2_tag_batch,
+            max_delay=self.ec2_tag_batch_delay,
+            max_batch_size=self.ec2_tag_batch_size
+        )
+        self._service_semaphores = {
+            resource_type: threading.Semaphore(self.max_concurrent_per_service)
+            for resource_type in self.supported_resource_types
+        }
     
     def list_resources(self) -> List[Resource]:
         """
@@ -27,50 +111,199 @@ class AWSConnector:
         Returns:
             List of Resource objects
         """
+        return list(self.iter_resources())
+    
+    def iter_resources(self) -> Iterator[Resource]:
+        """
+        Yield all supported AWS resources across regions as each fetch completes
+        
+        Yields:
+            Resource objects
+        """
+        regions = self._get_regions()
+        tag_index = TagIndex(self)
+        
+        # Fetch every (region, resource type) pair concurrently
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self._fetch, resource_type, resource_fetcher, region, tag_index): (region, resource_type)
+                for region in regions
+                for resource_type, resource_fetcher in self.supported_resource_types.items()
+            }
+            
+            for future in as_completed(futures):
+                region, resource_type = futures[future]
+                try:
+                    chunk = future.result()
+                except Exception as e:
+                    logger.error(f"Error fetching {resource_type} resources in {region}: {str(e)}")
+                    continue
+                yield from chunk
+    
+    async def list_resources_async(self) -> List[Resource]:
+        """
+        List all supported AWS resources across regions without blocking the event loop
+        
+        Each (region, resource type) fetch runs in a worker thread.
+        
+        Returns:
+            List of Resource objects
+        """
+        regions = await asyncio.to_thread(self._get_regions)
+        tag_index = TagIndex(self)
+        
+        tasks = [
+            (region, resource_type, resource_fetcher)
+            for region in regions
+            for resource_type, resource_fetcher in self.supported_resource_types.items()
+        ]
+        results = await asyncio.gather(
+            *(
+                asyncio.to_thread(self._fetch, resource_type, resource_fetcher, region, tag_index)
+                for region, resource_type, resource_fetcher in tasks
+            ),
+            return_exceptions=True
+        )
+        
         resources = []
+        for (region, resource_type, _), result in zip(tasks, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error fetching {resource_type} resources in {region}: {str(result)}")
+            else:
+                resources.extend(result)
+        
+        return resources
+    
+    def warm_up(self) -> None:
+        """
+        Create the clients a scan or tag update uses, without calling AWS
+        
+        Loading each service's botocore model is the slow part of the first call, and
+        it is shared by later clients of the same service in other regions.
+        """
+        region = self.regions[0] if self.regions else 'us-east-1'
+        for service in ('ec2', 's3', 'rds', 'lambda', 'resourcegroupstaggingapi'):
+            self._client(service, region)
+    
+    def list_slices(self) -> List[Tuple[Optional[str], str]]:
+        """
+        List the independent units a scan can be split into
         
-        # Get list of all regions
-        ec2_client = self.session.client('ec2', region_name='us-east-1')
+        Returns:
+            List of (region, resource type) pairs, one per fetch in iter_resources
+        """
+        return [
+            (region, resource_type)
+            for region in self._get_regions()
+            for resource_type in self.supported_resource_types
+        ]
+    
+    def list_resource_slice(self, resource_type: str, region: Optional[str] = None) -> List[Resource]:
+        """
+        Fetch one resource type in one region
+        
+        Args:
+            resource_type: Key of supported_resource_types
+            region: Region to fetch from
+            
+        Returns:
+            List of Resource objects
+        """
+        return self._fetch(resource_type, self.supported_resource_types[resource_type], region, TagIndex(self))
+    
+    def _fetch(self, resource_type: str, resource_fetcher, region: str, tag_index: TagIndex) -> List[Resource]:
+        """Run a fetcher, holding a slot in its service's concurrency limit"""
+        with self._service_semaphores[resource_type]:
+            return resource_fetcher(region, tag_index)
+    
+    def _get_regions(self) -> List[str]:
+        """
+        Get the regions to scan
+        
+        Uses the configured regions if any; otherwise the regions enabled for the
+        account, cached for regions_cache_ttl seconds so dead regions are never scanned.
+        """
+        if self.regions:
+            return self.regions
+        
+        if self._regions_cache and time.monotonic() - self._regions_cache[0] < self.regions_cache_ttl:
+            return self._regions_cache[1]
+        
+        ec2_client = self._client('ec2', 'us-east-1')
         try:
-            regions = [region['RegionName'] for region in ec2_client.describe_regions()['Regions']]
+            response = ec2_client.describe_regions(
+                Filters=[{'Name': 'opt-in-status', 'Values': ['opt-in-not-required', 'opted-in']}]
+            )
+            regions = [region['RegionName'] for region in response['Regions']]
+            self._regions_cache = (time.monotonic(), regions)
         except ClientError as e:
             logger.error(f"Error getting AWS regions: {str(e)}")
             regions = ['us-east-1', 'us-east-2', 'us-west-1', 'us-west-2', 'eu-west-1']
         
-        # Fetch resources from each region
-        for region in regions:
-            for resource_type, resource_fetcher in self.supported_resource_types.items():
-                try:
-                    region_resources = resource_fetcher(region)
-                    resources.extend(region_resources)
-                except Exception as e:
-                    logger.error(f"Error fetching {resource_type} resources in {region}: {str(e)}")
+        return regions
+    
+    def _client(self, service: str, region: Optional[str] = None):
+        """Get a cached boto3 client, creating it on first use; safe to call from worker threads"""
+        key = (service, region)
+        with self._client_lock:
+            client = self._client_cache.get(key)
+            if client is None:
+                client = self.session.client(service, region_name=region, config=CLIENT_CONFIG)
+                self._client_cache[key] = client
+            return client
+    
+    def _get_tags_by_arn(self, region: str, resource_types: List[str]) -> Optional[Dict[str, Dict[str, str]]]:
+        """
+        Get tags for all resources of the given types in a region from the Resource Groups Tagging API
         
-        return resources
+        Args:
+            region: AWS region
+            resource_types: Tagging API resource type filters (e.g. ['lambda:function'])
+            
+        Returns:
+            Dict mapping resource ARN to its tags, or None if the API call failed
+        """
+        tag_client = self._client('resourcegroupstaggingapi', region)
+        
+        try:
+            paginator = tag_client.get_paginator('get_resources')
+            pages = paginator.paginate(ResourceTypeFilters=resource_types)
+            
+            return {
+                mapping['ResourceARN']: {tag['Key']: tag['Value'] for tag in mapping.get('Tags', [])}
+                for page in pages
+                for mapping in page.get('ResourceTagMappingList', [])
+            }
+        except ClientError as e:
+            logger.warning(f"Error getting tags in {region}: {str(e)}")
+            return None
     
-    def _get_ec2_resources(self, region: str) -> List[Resource]:
+    def _get_ec2_resources(self, region: str, tag_index: Optional[TagIndex] = None) -> List[Resource]:
         """Get EC2 instances in the specified region"""
-        ec2_client = self.session.client('ec2', region_name=region)
+        ec2_client = self._client('ec2', region)
         resources = []
         
         try:
-            response = ec2_client.describe_instances()
+            # Paginate so accounts with more than one page of instances are not truncated
+            paginator = ec2_client.get_paginator('describe_instances')
+            pages = paginator.paginate(PaginationConfig={'PageSize': 1000})
             
-            for reservation in response.get('Reservations', []):
-                for instance in reservation.get('Instances', []):
-                    instance_id = instance['InstanceId']
-                    tags = {tag['Key']: tag['Value'] for tag in instance.get('Tags', [])}
-                    
-                    resource = Resource(
-                        resource_id=instance_id,
-                        name=tags.get('Name', instance_id),
-                        resource_type='ec2',
-                        cloud_provider='aws',
-                        region=region,
-                        tags=tags,
-                        compliance_status=ComplianceStatus.UNKNOWN
-                    )
-                    resources.append(resource)
+            for page in pages:
+                for reservation in page.get('Reservations', []):
+                    for instance in reservation.get('Instances', []):
+                        instance_id = instance['InstanceId']
+                        tags = {tag['Key']: tag['Value'] for tag in instance.get('Tags', [])}
+                        
+                        resource = Resource(
+                            resource_id=instance_id,
+                            name=tags.get('Name', instance_id),
+                            resource_type='ec2',
+                            cloud_provider='aws',
+                            region=region,
+                            tags=tags,
+                            compliance_status=ComplianceStatus.UNKNOWN
+                        )
+                        resources.append(resource)
                     
             return resources
             
@@ -78,37 +311,55 @@ class AWSConnector:
             logger.error(f"Error getting EC2 instances in {region}: {str(e)}")
             return []
     
-    def _get_s3_resources(self, region: str) -> List[Resource]:
+    def _get_s3_resources(self, region: str, tag_index: Optional[TagIndex] = None) -> List[Resource]:
         """Get S3 buckets"""
-        # S3 is a global service, so we only need to fetch once
-        if region != 'us-east-1':
+        # S3 is a global service, so we only need to fetch once; use us-east-1 unless
+        # the scan is pinned to regions that exclude it
+        global_region = 'us-east-1'
+        if self.regions and global_region not in self.regions:
+            global_region = self.regions[0]
+        if region != global_region:
             return []
             
-        s3_client = self.session.client('s3')
+        s3_client = self._client('s3')
+        tag_index = tag_index or TagIndex(self)
         resources = []
         
         try:
             response = s3_client.list_buckets()
+            bucket_names = [bucket['Name'] for bucket in response.get('Buckets', [])]
             
-            for bucket in response.get('Buckets', []):
-                bucket_name = bucket['Name']
-                
-                # Get bucket tags
-                try:
-                    tag_response = s3_client.get_bucket_tagging(Bucket=bucket_name)
-                    tags = {tag['Key']: tag['Value'] for tag in tag_response.get('TagSet', [])}
-                except ClientError:
-                    # Bucket might not have tags
-                    tags = {}
+            # Look up bucket regions concurrently
+            bucket_regions = {}
+            with ThreadPoolExecutor(max_workers=16) as executor:
+                futures = {
+                    executor.submit(self._get_bucket_region, s3_client, bucket_name): bucket_name
+                    for bucket_name in bucket_names
+                }
+                for future in as_completed(futures):
+                    bucket_regions[futures[future]] = future.result()
+            
+            # The tagging API only returns buckets in the region it is called in
+            tags_by_region = {
+                bucket_region: tag_index.for_region(bucket_region)
+                for bucket_region in set(bucket_regions.values())
+                if bucket_region != 'unknown'
+            }
+            
+            for bucket_name in bucket_names:
+                bucket_region = bucket_regions[bucket_name]
+                tags_by_arn = tags_by_region.get(bucket_region)
                 
-                # Get bucket region
-                try:
-                    bucket_region = s3_client.get_bucket_location(Bucket=bucket_name)
-                    bucket_region = bucket_region.get('LocationConstraint', 'us-east-1')
-                    if bucket_region is None:
-                        bucket_region = 'us-east-1'
-                except ClientError:
-                    bucket_region = 'unknown'
+                if tags_by_arn is not None:
+                    tags = tags_by_arn.get(f"arn:aws:s3:::{bucket_name}", {})
+                else:
+                    # Tagging API unavailable; fall back to a call per bucket
+                    try:
+                        tag_response = s3_client.get_bucket_tagging(Bucket=bucket_name)
+                        tags = {tag['Key']: tag['Value'] for tag in tag_response.get('TagSet', [])}
+                    except ClientError:
+                        # Bucket might not have tags
+                        tags = {}
                 
                 resource = Resource(
                     resource_id=bucket_name,
@@ -127,24 +378,30 @@ class AWSConnector:
             logger.error(f"Error getting S3 buckets: {str(e)}")
             return []
     
-    def _get_rds_resources(self, region: str) -> List[Resource]:
+    def _get_bucket_region(self, s3_client, bucket_name: str) -> str:
+        """Get the region of an S3 bucket, or 'unknown' if it cannot be read"""
+        try:
+            bucket_region = s3_client.get_bucket_location(Bucket=bucket_name)
+            # Buckets in us-east-1 report a null location constraint
+            return bucket_region.get('LocationConstraint') or 'us-east-1'
+        except ClientError:
+            return 'unknown'
+    
+    def _get_rds_resources(self, region: str, tag_index: Optional[TagIndex] = None) -> List[Resource]:
         """Get RDS instances in the specified region"""
-        rds_client = self.session.client('rds', region_name=region)
+        rds_client = self._client('rds', region)
         resources = []
         
         try:
-            response = rds_client.describe_db_instances()
+            # RDS caps pages at 100 records
+            paginator = rds_client.get_paginator('describe_db_instances')
+            pages = paginator.paginate(PaginationConfig={'PageSize': 100})
             
-            for instance in response.get('DBInstances', []):
+            for instance in (instance for page in pages for instance in page.get('DBInstances', [])):
                 instance_id = instance['DBInstanceIdentifier']
                 
-                # Get instance tags
-                try:
-                    arn = instance['DBInstanceArn']
-                    tag_response = rds_client.list_tags_for_resource(ResourceName=arn)
-                    tags = {tag['Key']: tag['Value'] for tag in tag_response.get('TagList', [])}
-                except ClientError:
-                    tags = {}
+                # DescribeDBInstances embeds the instance tags, so no per-instance call is needed
+                tags = {tag['Key']: tag['Value'] for tag in instance.get('TagList', [])}
                 
                 resource = Resource(
                     resource_id=instance_id,
@@ -163,24 +420,35 @@ class AWSConnector:
             logger.error(f"Error getting RDS instances in {region}: {str(e)}")
             return []
     
-    def _get_lambda_resources(self, region: str) -> List[Resource]:
+    def _get_lambda_resources(self, region: str, tag_index: Optional[TagIndex] = None) -> List[Resource]:
         """Get Lambda functions in the specified region"""
-        lambda_client = self.session.client('lambda', region_name=region)
+        lambda_client = self._client('lambda', region)
+        tag_index = tag_index or TagIndex(self)
         resources = []
         
         try:
-            response = lambda_client.list_functions()
+            # Lambda caps pages at 50 functions
+            paginator = lambda_client.get_paginator('list_functions')
+            pages = paginator.paginate(PaginationConfig={'PageSize': 50})
+            
+            functions = [function for page in pages for function in page.get('Functions', [])]
+            
+            # Tags for every function in the region from the shared regional sweep
+            tags_by_arn = tag_index.for_region(region)
             
-            for function in response.get('Functions', []):
+            if tags_by_arn is None:
+                # Tagging API unavailable; fall back to concurrent calls per function
+                with ThreadPoolExecutor(max_workers=16) as executor:
+                    function_arns = [function['FunctionArn'] for function in functions]
+                    tags_by_arn = dict(zip(
+                        function_arns,
+                        executor.map(lambda arn: self._get_function_tags(lambda_client, arn), function_arns)
+                    ))
+            
+            for function in functions:
                 function_name = function['FunctionName']
                 function_arn = function['FunctionArn']
-                
-                # Get function tags
-                try:
-                    tag_response = lambda_client.list_tags(Resource=function_arn)
-                    tags = tag_response.get('Tags', {})
-                except ClientError:
-                    tags = {}
+                tags = tags_by_arn.get(function_arn, {})
                 
                 resource = Resource(
                     resource_id=function_arn,
@@ -199,74 +467,214 @@ class AWSConnector:
             logger.error(f"Error getting Lambda functions in {region}: {str(e)}")
             return []
     
-    def update_resource_tags(self, resource_id: str, tags: Dict[str, str]) -> bool:
+    def _get_function_tags(self, lambda_client, function_arn: str) -> Dict[str, str]:
+        """Get a Lambda function's tags, or an empty dict if they cannot be read"""
+        try:
+            return lambda_client.list_tags(Resource=function_arn).get('Tags', {})
+        except ClientError:
+            return {}
+    
+    def update_resource_tags(self, resource_id: str, tags: Dict[str, str], region: Optional[str] = None) -> bool:
         """
         Update tags for a specified AWS resource
         
         Args:
-            resource_id: AWS resource ID
+            resource_id: AWS resource ID (EC2 instance ID or ARN)
             tags: Dict of tag keys and values to apply
+            region: Optional region for IDs that do not carry one, such as EC2 instance IDs
             
         Returns:
             Boolean indicating success
         """
-        # Determine resource type and region from the resource ID
-        if resource_id.startswith('i-'):
-            # EC2 instance
-            resource_type = 'ec2'
-            # Extract region from ARN or assume default
-            region = 'us-east-1'  # Default if we can't determine
-            
-            # Create EC2 client
-            ec2_client = self.session.client('ec2', region_name=region)
-            
-            try:
-                # Format tags for EC2
-                tag_list = [{'Key': key, 'Value': value} for key, value in tags.items()]
-                ec2_client.create_tags(Resources=[resource_id], Tags=tag_list)
-                return True
-            except ClientError as e:
-                logger.error(f"Error updating tags for EC2 instance {resource_id}: {str(e)}")
-                return False
-                
-        elif resource_id.startswith('arn:aws:s3'):
-            # S3 bucket
-            bucket_name = resource_id.split(':')[-1]
-            s3_client = self.session.client('s3')
+        service, arn_region = self._parse_resource_id(resource_id)
+        tagger = self._tag_dispatch.get(service)
+        
+        if tagger is None:
+            logger.error(f"Unsupported resource type for ID: {resource_id}")
+            return False
+        
+        return tagger(resource_id, tags, arn_region or region)
+    
+    def update_resource_tags_batch(
+        self,
+        resource_ids: List[str],
+        tags: Dict[str, str],
+        region: Optional[str] = None
+    ) -> bool:
+        """
+        Apply the same tags to many AWS resources
+        
+        EC2 instances are tagged with CreateTags calls of up to 1000 IDs each.
+        
+        Args:
+            resource_ids: AWS resource IDs (EC2 instance IDs or ARNs)
+            tags: Dict of tag keys and values to apply
+            region: Optional region for IDs that do not carry one, such as EC2 instance IDs
             
-            try:
-                # Format tags for S3
-                tag_set = [{'Key': key, 'Value': value} for key, value in tags.items()]
-                s3_client.put_bucket_tagging(Bucket=bucket_name, Tagging={'TagSet': tag_set})
-                return True
-            except ClientError as e:
-                logger.error(f"Error updating tags for S3 bucket {resource_id}: {str(e)}")
-                return False
-                
-        elif resource_id.startswith('arn:aws:rds'):
-            # RDS instance
-            rds_client = self.session.client('rds')
+        Returns:
+            Boolean indicating whether every resource was tagged
+        """
+        results = self.update_resource_tags_bulk([(resource_id, tags) for resource_id in resource_ids], region)
+        return all(results.values())
+    
+    def update_resource_tags_bulk(
+        self,
+        items: List[Tuple[str, Dict[str, str]]],
+        region: Optional[str] = None,
+        max_workers: int = 16
+    ) -> Dict[str, bool]:
+        """
+        Update tags for many AWS resources
+        
+        EC2 instances in the same region receiving the same tags share CreateTags
+        calls, and Lambda/RDS ARNs likewise share TagResources calls; every other
+        resource is tagged concurrently.
+        
+        Args:
+            items: List of (resource ID, tags) pairs
+            region: Optional region for IDs that do not carry one, such as EC2 instance IDs
+            max_workers: Most tagging calls in flight at once
             
-            try:
-                # Format tags for RDS
-                tag_list = [{'Key': key, 'Value': value} for key, value in tags.items()]
-                rds_client.add_tags_to_resource(ResourceName=resource_id, Tags=tag_list)
-                return True
-            except ClientError as e:
-                logger.error(f"Error updating tags for RDS instance {resource_id}: {str(e)}")
-                return False
-                
-        elif resource_id.startswith('arn:aws:lambda'):
-            # Lambda function
-            lambda_client = self.session.client('lambda')
+        Returns:
+            Dict mapping resource ID to a boolean indicating success
+        """
+        results = {}
+        ec2_groups: Dict[Tuple[Optional[str], frozenset], List[str]] = {}
+        arn_groups: Dict[Tuple[str, frozenset], List[str]] = {}
+        others = []
+        
+        for resource_id, tags in items:
+            service, arn_region = self._parse_resource_id(resource_id)
+            if service == 'ec2':
+                ec2_groups.setdefault((arn_region or region, frozenset(tags.items())), []).append(resource_id)
+            elif service in self.tag_resources_services and arn_region:
+                arn_groups.setdefault((arn_region, frozenset(tags.items())), []).append(resource_id)
+            elif service in self._tag_dispatch:
+                others.append((resource_id, tags, service, arn_region or region))
+            else:
+                logger.error(f"Unsupported resource type for ID: {resource_id}")
+                results[resource_id] = False
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for (group_region, tag_items), resource_ids in ec2_groups.items():
+                future = executor.submit(self._create_ec2_tags, resource_ids, dict(tag_items), group_region)
+                futures[future] = resource_ids
+            for (group_region, tag_items), arns in arn_groups.items():
+                for start in range(0, len(arns), self.tag_resources_batch_size):
+                    chunk = arns[start:start + self.tag_resources_batch_size]
+                    future = executor.submit(self._tag_resources, chunk, dict(tag_items), group_region)
+                    futures[future] = chunk
+            for resource_id, tags, service, resource_region in others:
+                future = executor.submit(self._tag_dispatch[service], resource_id, tags, resource_region)
+                futures[future] = [resource_id]
             
+            for future in as_completed(futures):
+                outcome = future.result()
+                for resource_id in futures[future]:
+                    # TagResources reports per ARN; the other calls succeed or fail as a whole
+                    results[resource_id] = outcome[resource_id] if isinstance(outcome, dict) else outcome
+        
+        return results
+    
+    def _parse_resource_id(self, resource_id: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Get the service and region for a resource ID
+        
+        EC2 instance IDs carry no region; ARNs are arn:partition:service:region:account:resource.
+        
+        Returns:
+            Tuple of (service, region); service is None if the ID is not recognized
+        """
+        if resource_id.startswith('i-'):
+            return 'ec2', None
+        
+        if resource_id.startswith('arn:'):
+            parts = resource_id.split(':', 5)
+            if len(parts) == 6:
+                return parts[2], parts[3] or None
+        
+        return None, None
+    
+    def _tag_ec2(self, resource_id: str, tags: Dict[str, str], region: Optional[str]) -> bool:
+        """Tag an EC2 instance given its ID or ARN, sharing a CreateTags call with concurrent updates"""
+        return self._ec2_tag_batcher.add((region, frozenset(tags.items())), resource_id)
+    
+    def _execute_ec2_tag_batch(self, key: Tuple[Optional[str], frozenset], resource_ids: List[str]) -> bool:
+        """Send a batch of EC2 tag updates collected by the batcher"""
+        region, tag_items = key
+        return self._create_ec2_tags(resource_ids, dict(tag_items), region)
+    
+    def _create_ec2_tags(self, resource_ids: List[str], tags: Dict[str, str], region: Optional[str]) -> bool:
+        """Apply the same tags to EC2 instances in one region, up to 1000 instances per CreateTags call"""
+        # Default if we can't determine the region
+        ec2_client = self._client('ec2', region or 'us-east-1')
+        # CreateTags takes instance IDs, so strip the ARN prefix if present
+        instance_ids = [resource_id.rsplit('/', 1)[-1] for resource_id in resource_ids]
+        # Format tags for EC2
+        tag_list = [{'Key': key, 'Value': value} for key, value in tags.items()]
+        success = True
+        
+        for start in range(0, len(instance_ids), self.ec2_tag_batch_size):
+            chunk = instance_ids[start:start + self.ec2_tag_batch_size]
             try:
-                lambda_client.tag_resource(Resource=resource_id, Tags=tags)
-                return True
+                ec2_client.create_tags(Resources=chunk, Tags=tag_list)
             except ClientError as e:
-                logger.error(f"Error updating tags for Lambda function {resource_id}: {str(e)}")
-                return False
-                
-        else:
-            logger.error(f"Unsupported resource type for ID: {resource_id}")
+                logger.error(f"Error updating tags for EC2 instances {chunk}: {str(e)}")
+                success = False
+        
+        return success
+    
+    def _tag_resources(self, arns: List[str], tags: Dict[str, str], region: str) -> Dict[str, bool]:
+        """Apply the same tags to up to 20 ARNs in one region with a single TagResources call"""
+        tag_client = self._client('resourcegroupstaggingapi', region)
+        
+        try:
+            response = tag_client.tag_resources(ResourceARNList=arns, Tags=tags)
+        except ClientError as e:
+            logger.error(f"Error updating tags for {arns}: {str(e)}")
+            return {arn: False for arn in arns}
+        
+        failed = response.get('FailedResourcesMap', {})
+        for arn, failure in failed.items():
+            logger.error(f"Error updating tags for {arn}: {failure.get('ErrorMessage')}")
+        
+        return {arn: arn not in failed for arn in arns}
+    
+    def _tag_s3(self, resource_id: str, tags: Dict[str, str], region: Optional[str]) -> bool:
+        """Tag an S3 bucket given its ARN"""
+        bucket_name = resource_id.split(':')[-1]
+        s3_client = self._client('s3')
+        
+        try:
+            # Format tags for S3
+            tag_set = [{'Key': key, 'Value': value} for key, value in tags.items()]
+            s3_client.put_bucket_tagging(Bucket=bucket_name, Tagging={'TagSet': tag_set})
+            return True
+        except ClientError as e:
+            logger.error(f"Error updating tags for S3 bucket {resource_id}: {str(e)}")
+            return False
+    
+    def _tag_rds(self, resource_id: str, tags: Dict[str, str], region: Optional[str]) -> bool:
+        """Tag an RDS instance given its ARN"""
+        rds_client = self._client('rds', region)
+        
+        try:
+            # Format tags for RDS
+            tag_list = [{'Key': key, 'Value': value} for key, value in tags.items()]
+            rds_client.add_tags_to_resource(ResourceName=resource_id, Tags=tag_list)
+            return True
+        except ClientError as e:
+            logger.error(f"Error updating tags for RDS instance {resource_id}: {str(e)}")
+            return False
+    
+    def _tag_lambda(self, resource_id: str, tags: Dict[str, str], region: Optional[str]) -> bool:
+        """Tag a Lambda function given its ARN"""
+        lambda_client = self._client('lambda', region)
+        
+        try:
+            lambda_client.tag_resource(Resource=resource_id, Tags=tags)
+            return True
+        except ClientError as e:
+            logger.error(f"Error updating tags for Lambda function {resource_id}: {str(e)}")
             return False
\ No newline at end of file
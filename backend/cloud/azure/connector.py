@@ -1,6 +1,9 @@
 # cloud/azure/connector.py
+import asyncio
+import functools
 import logging
-from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 
 from azure.identity import DefaultAzureCredential
 from azure.mgmt.resource import ResourceManagementClient
@@ -22,7 +25,22 @@ class AzureConnector:
             'vm': self._get_virtual_machines,
             'storage-account': self._get_storage_accounts,
         }
-        
+    
+    @functools.cached_property
+    def compute_client(self) -> ComputeManagementClient:
+        """Compute management client, created on first use and shared across calls"""
+        return ComputeManagementClient(self.credential, self.subscription_id)
+    
+    @functools.cached_property
+    def storage_client(self) -> StorageManagementClient:
+        """Storage management client, created on first use and shared across calls"""
+        return StorageManagementClient(self.credential, self.subscription_id)
+    
+    @functools.cached_property
+    def resource_client(self) -> ResourceManagementClient:
+        """Resource management client, created on first use and shared across calls"""
+        return ResourceManagementClient(self.credential, self.subscription_id)
+    
     def _get_subscription_id(self) -> str:
         """Get the Azure subscription ID from environment variables"""
         import os
@@ -41,14 +59,82 @@ class AzureConnector:
         Returns:
             List of Resource objects
         """
-        resources = []
+        return list(self.iter_resources())
+    
+    def iter_resources(self) -> Iterator[Resource]:
+        """
+        Yield all supported Azure resources as each fetch completes
+        
+        Yields:
+            Resource objects
+        """
+        # Each fetcher talks to its own API, so run them concurrently
+        with ThreadPoolExecutor(max_workers=len(self.supported_resource_types)) as executor:
+            futures = {
+                executor.submit(resource_fetcher): resource_type
+                for resource_type, resource_fetcher in self.supported_resource_types.items()
+            }
+            
+            for future in as_completed(futures):
+                resource_type = futures[future]
+                try:
+                    chunk = future.result()
+                except Exception as e:
+                    logger.error(f"Error fetching {resource_type} resources: {str(e)}")
+                    continue
+                yield from chunk
+    
+    def warm_up(self) -> None:
+        """Create the management clients ahead of the first scan, without calling Azure"""
+        self.compute_client
+        self.storage_client
+        self.resource_client
+    
+    def list_slices(self) -> List[Tuple[Optional[str], str]]:
+        """
+        List the independent units a scan can be split into
+        
+        Azure fetchers are not split by region, so each resource type is one slice.
+        
+        Returns:
+            List of (region, resource type) pairs with region None
+        """
+        return [(None, resource_type) for resource_type in self.supported_resource_types]
+    
+    def list_resource_slice(self, resource_type: str, region: Optional[str] = None) -> List[Resource]:
+        """
+        Fetch one resource type
+        
+        Args:
+            resource_type: Key of supported_resource_types
+            region: Unused; accepted for parity with the AWS connector
+            
+        Returns:
+            List of Resource objects
+        """
+        return self.supported_resource_types[resource_type]()
+    
+    async def list_resources_async(self) -> List[Resource]:
+        """
+        List all supported Azure resources without blocking the event loop
         
-        for resource_type, resource_fetcher in self.supported_resource_types.items():
-            try:
-                type_resources = resource_fetcher()
-                resources.extend(type_resources)
-            except Exception as e:
-                logger.error(f"Error fetching {resource_type} resources: {str(e)}")
+        Each fetcher runs in a worker thread.
+        
+        Returns:
+            List of Resource objects
+        """
+        resource_types = list(self.supported_resource_types.items())
+        results = await asyncio.gather(
+            *(asyncio.to_thread(resource_fetcher) for _, resource_fetcher in resource_types),
+            return_exceptions=True
+        )
+        
+        resources = []
+        for (resource_type, _), result in zip(resource_types, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error fetching {resource_type} resources: {str(result)}")
+            else:
+                resources.extend(result)
         
         return resources
     
@@ -57,38 +143,29 @@ class AzureConnector:
         resources = []
         
         try:
-            # Create Azure clients
-            compute_client = ComputeManagementClient(self.credential, self.subscription_id)
-            resource_client = ResourceManagementClient(self.credential, self.subscription_id)
+            compute_client = self.compute_client
             
-            # Get all resource groups
-            resource_groups = resource_client.resource_groups.list()
+            # One paginated call for every VM in the subscription
+            vms = compute_client.virtual_machines.list_all()
             
-            # Iterate through each resource group
-            for resource_group in resource_groups:
-                rg_name = resource_group.name
+            for vm in vms:
+                vm_id = vm.id
+                vm_name = vm.name
+                vm_location = vm.location
                 
-                # Get all VMs in the resource group
-                vms = compute_client.virtual_machines.list(rg_name)
+                # Get VM tags
+                tags = vm.tags or {}
                 
-                for vm in vms:
-                    vm_id = vm.id
-                    vm_name = vm.name
-                    vm_location = vm.location
-                    
-                    # Get VM tags
-                    tags = vm.tags or {}
-                    
-                    resource = Resource(
-                        resource_id=vm_id,
-                        name=vm_name,
-                        resource_type='vm',
-                        cloud_provider='azure',
-                        region=vm_location,
-                        tags=tags,
-                        compliance_status=ComplianceStatus.UNKNOWN
-                    )
-                    resources.append(resource)
+                resource = Resource(
+                    resource_id=vm_id,
+                    name=vm_name,
+                    resource_type='vm',
+                    cloud_provider='azure',
+                    region=vm_location,
+                    tags=tags,
+                    compliance_status=ComplianceStatus.UNKNOWN
+                )
+                resources.append(resource)
         
         except AzureError as e:
             logger.error(f"Azure error getting VMs: {str(e)}")
@@ -102,8 +179,7 @@ class AzureConnector:
         resources = []
         
         try:
-            # Create Azure clients
-            storage_client = StorageManagementClient(self.credential, self.subscription_id)
+            storage_client = self.storage_client
             
             # Get all storage accounts
             storage_accounts = storage_client.storage_accounts.list()
@@ -134,39 +210,65 @@ class AzureConnector:
         
         return resources
     
-    def update_resource_tags(self, resource_id: str, tags: Dict[str, str]) -> bool:
+    def update_resource_tags(self, resource_id: str, tags: Dict[str, str], replace: bool = False) -> bool:
         """
         Update tags for a specified Azure resource
         
         Args:
             resource_id: Azure resource ID
             tags: Dict of tag keys and values to apply
+            replace: If True, tags is the full tag set and replaces the existing tags;
+                otherwise it is merged into them
             
         Returns:
             Boolean indicating success
         """
-        try:
-            # Create Azure client
-            resource_client = ResourceManagementClient(self.credential, self.subscription_id)
-            
-            # Get current resource
-            api_version = "2021-04-01"  # Update with appropriate API version
-            resource_info = resource_client.resources.get_by_id(resource_id, api_version)
-            
-            # Merge existing tags with new tags
-            existing_tags = resource_info.tags or {}
-            merged_tags = {**existing_tags, **tags}
+        return self._update_tags_at_scope(resource_id, tags, replace)
+    
+    def update_resource_tags_bulk(
+        self,
+        items: List[Tuple[str, Dict[str, str]]],
+        replace: bool = False,
+        max_workers: int = 16
+    ) -> Dict[str, bool]:
+        """
+        Update tags for many Azure resources concurrently
+        
+        The Tags API has no multi-resource call, so one request per resource is sent
+        from a thread pool.
+        
+        Args:
+            items: List of (resource ID, tags) pairs
+            replace: If True, each tags dict replaces the resource's existing tags
+            max_workers: Most Tags API requests in flight at once
             
-            # Update resource tags
-            # Note: This is a generic approach. For specific resource types,
-            # using the specific client (like ComputeManagementClient for VMs)
-            # might be more appropriate.
-            resource_client.resources.begin_update_by_id(
-                resource_id=resource_id,
-                api_version=api_version,
-                parameters={'tags': merged_tags}
+        Returns:
+            Dict mapping resource ID to a boolean indicating success
+        """
+        results = {}
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self._update_tags_at_scope, resource_id, tags, replace): resource_id
+                for resource_id, tags in items
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        
+        return results
+    
+    def _update_tags_at_scope(self, resource_id: str, tags: Dict[str, str], replace: bool) -> bool:
+        """Merge or replace a resource's tags with a single Tags API call"""
+        try:
+            # The Tags API merges or replaces server-side in one call, so there is no
+            # need to GET the resource first or poll a long-running update
+            self.resource_client.tags.update_at_scope(
+                scope=resource_id,
+                parameters={
+                    'operation': 'Replace' if replace else 'Merge',
+                    'properties': {'tags': tags}
+                }
             )
-            
             return True
             
         except AzureError as e:
@@ -1,13 +1,17 @@
 # cloud/gcp/connector.py
+import asyncio
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional, Tuple
+import functools
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from google.cloud import resourcemanager_v3
 from google.cloud import compute_v1
 from google.cloud import storage
 from google.api_core.exceptions import GoogleAPIError
+from google.oauth2 import service_account
 
 from models.resource import Resource, ComplianceStatus
 
@@ -16,37 +20,53 @@ logger = logging.getLogger(__name__)
 class GCPConnector:
     """Connector for Google Cloud Platform resources"""
     
-    def __init__(self):
+    def __init__(self, zones: Optional[List[str]] = None):
         # Load credentials from environment variable
+        self._credentials = None
+        self._credentials_info: Dict[str, Any] = {}
         self._setup_credentials()
         
         self.project_id = self._get_project_id()
+        # Zones to list instances from: explicit list, then GCP_ZONES, else every zone
+        if zones is None and os.getenv("GCP_ZONES"):
+            zones = [zone.strip() for zone in os.getenv("GCP_ZONES").split(",") if zone.strip()]
+        self.zones = zones
+        # Instance ID -> (zone, name) from the last scan, so label updates can skip
+        # the project-wide aggregated lookup
+        self._instance_zone_cache: Dict[str, Tuple[str, str]] = {}
         self.supported_resource_types = {
             'compute-instance': self._get_compute_instances,
             'storage-bucket': self._get_storage_buckets,
         }
     
+    @functools.cached_property
+    def compute_client(self) -> compute_v1.InstancesClient:
+        """Compute instances client, created on first use and shared so its channel is reused"""
+        return compute_v1.InstancesClient(credentials=self._credentials)
+    
+    @functools.cached_property
+    def storage_client(self) -> storage.Client:
+        """Storage client, created on first use and shared so its HTTP session is reused"""
+        return storage.Client(credentials=self._credentials, project=self.project_id)
+    
     def _setup_credentials(self):
         """Set up GCP credentials from environment"""
         # GCP authentication is usually handled through Application Default Credentials
         # or by setting GOOGLE_APPLICATION_CREDENTIALS environment variable
         creds_json = os.getenv("GCP_SERVICE_ACCOUNT_JSON")
         if creds_json:
-            # If credentials are provided as a JSON string, write to a temp file
+            # If credentials are provided as a JSON string, build them in memory and
+            # pass them to each client
             try:
-                import tempfile
-                with tempfile.NamedTemporaryFile(delete=False, mode='w') as temp:
-                    temp.write(creds_json)
-                    temp_filename = temp.name
-                
-                os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = temp_filename
+                self._credentials_info = json.loads(creds_json)
+                self._credentials = service_account.Credentials.from_service_account_info(self._credentials_info)
                 logger.info("GCP credentials loaded from environment variable")
             except Exception as e:
                 logger.error(f"Error setting up GCP credentials: {str(e)}")
     
     def _get_project_id(self) -> str:
         """Get the GCP project ID from environment variables"""
-        project_id = os.getenv("GCP_PROJECT_ID")
+        project_id = os.getenv("GCP_PROJECT_ID") or self._credentials_info.get('project_id')
         if not project_id:
             # Try to get from credentials file
             creds_file = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
@@ -71,24 +91,104 @@ class GCPConnector:
         Returns:
             List of Resource objects
         """
-        resources = []
+        return list(self.iter_resources())
+    
+    def iter_resources(self) -> Iterator[Resource]:
+        """
+        Yield all supported GCP resources as each fetch completes
         
-        for resource_type, resource_fetcher in self.supported_resource_types.items():
-            try:
-                type_resources = resource_fetcher()
-                resources.extend(type_resources)
-            except Exception as e:
-                logger.error(f"Error fetching {resource_type} resources: {str(e)}")
+        Yields:
+            Resource objects
+        """
+        # Each fetcher talks to its own API, so run them concurrently
+        with ThreadPoolExecutor(max_workers=len(self.supported_resource_types)) as executor:
+            futures = {
+                executor.submit(resource_fetcher): resource_type
+                for resource_type, resource_fetcher in self.supported_resource_types.items()
+            }
+            
+            for future in as_completed(futures):
+                resource_type = futures[future]
+                try:
+                    chunk = future.result()
+                except Exception as e:
+                    logger.error(f"Error fetching {resource_type} resources: {str(e)}")
+                    continue
+                yield from chunk
+    
+    def warm_up(self) -> None:
+        """Create the API clients ahead of the first scan, without calling GCP"""
+        self.compute_client
+        self.storage_client
+    
+    def list_slices(self) -> List[Tuple[Optional[str], str]]:
+        """
+        List the independent units a scan can be split into
+        
+        GCP fetchers are not split by region, so each resource type is one slice.
+        
+        Returns:
+            List of (region, resource type) pairs with region None
+        """
+        return [(None, resource_type) for resource_type in self.supported_resource_types]
+    
+    def list_resource_slice(self, resource_type: str, region: Optional[str] = None) -> List[Resource]:
+        """
+        Fetch one resource type
+        
+        Args:
+            resource_type: Key of supported_resource_types
+            region: Unused; accepted for parity with the AWS connector
+            
+        Returns:
+            List of Resource objects
+        """
+        return self.supported_resource_types[resource_type]()
+    
+    async def list_resources_async(self) -> List[Resource]:
+        """
+        List all supported GCP resources without blocking the event loop
+        
+        Each fetcher runs in a worker thread.
+        
+        Returns:
+            List of Resource objects
+        """
+        resource_types = list(self.supported_resource_types.items())
+        results = await asyncio.gather(
+            *(asyncio.to_thread(resource_fetcher) for _, resource_fetcher in resource_types),
+            return_exceptions=True
+        )
+        
+        resources = []
+        for (resource_type, _), result in zip(resource_types, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error fetching {resource_type} resources: {str(result)}")
+            else:
+                resources.extend(result)
         
         return resources
     
-    def _get_compute_instances(self) -> List[Resource]:
-        """Get GCP compute instances"""
+    def _get_compute_instances(self, zones: Optional[List[str]] = None) -> List[Resource]:
+        """
+        Get GCP compute instances
+        
+        Args:
+            zones: Optional zones to list; defaults to the connector's zones. When no
+                zones are configured, all zones are listed with one aggregated request.
+        """
         resources = []
+        zones = zones or self.zones
         
         try:
-            # Create Compute client
-            instance_client = compute_v1.InstancesClient()
+            instance_client = self.compute_client
+            
+            if zones:
+                # List only the known zones, concurrently
+                with ThreadPoolExecutor(max_workers=min(len(zones), 16)) as executor:
+                    for zone_resources in executor.map(self._list_zone_instances, zones):
+                        resources.extend(zone_resources)
+                return resources
             
             # List instances for all zones in the project
             request = compute_v1.AggregatedListInstancesRequest(project=self.project_id)
@@ -97,24 +197,9 @@ class GCPConnector:
             # Process each zone
             for zone, response in instances_iterator:
                 if response.instances:
+                    zone_name = zone.split('/')[-1]  # Extract zone name from key
                     for instance in response.instances:
-                        instance_id = instance.id
-                        instance_name = instance.name
-                        zone_name = zone.split('/')[-1]  # Extract zone name from key
-                        
-                        # Get instance labels (GCP uses labels instead of tags)
-                        tags = instance.labels or {}
-                        
-                        resource = Resource(
-                            resource_id=str(instance_id),
-                            name=instance_name,
-                            resource_type='compute-instance',
-                            cloud_provider='gcp',
-                            region=zone_name,
-                            tags=tags,
-                            compliance_status=ComplianceStatus.UNKNOWN
-                        )
-                        resources.append(resource)
+                        resources.append(self._instance_to_resource(instance, zone_name))
             
         except GoogleAPIError as e:
             logger.error(f"GCP API error getting compute instances: {str(e)}")
@@ -123,13 +208,35 @@ class GCPConnector:
         
         return resources
     
+    def _list_zone_instances(self, zone: str) -> List[Resource]:
+        """Get the compute instances in a single zone"""
+        instances = self.compute_client.list(project=self.project_id, zone=zone)
+        return [self._instance_to_resource(instance, zone) for instance in instances]
+    
+    def _instance_to_resource(self, instance: compute_v1.Instance, zone_name: str) -> Resource:
+        """Build a Resource for a compute instance and remember its zone for label updates"""
+        instance_id = str(instance.id)
+        self._instance_zone_cache[instance_id] = (zone_name, instance.name)
+        
+        # Get instance labels (GCP uses labels instead of tags)
+        tags = instance.labels or {}
+        
+        return Resource(
+            resource_id=instance_id,
+            name=instance.name,
+            resource_type='compute-instance',
+            cloud_provider='gcp',
+            region=zone_name,
+            tags=tags,
+            compliance_status=ComplianceStatus.UNKNOWN
+        )
+    
     def _get_storage_buckets(self) -> List[Resource]:
         """Get GCP storage buckets"""
         resources = []
         
         try:
-            # Create Storage client
-            storage_client = storage.Client()
+            storage_client = self.storage_client
             
             # List all buckets
             buckets = storage_client.list_buckets()
@@ -178,52 +285,69 @@ class GCPConnector:
             # Likely a storage bucket
             return self._update_storage_bucket_labels(resource_id, tags)
     
-    def _update_compute_instance_labels(self, instance_id: str, labels: Dict[str, str]) -> bool:
-        """Update labels for a compute instance"""
-        try:
-            # Create Compute client
-            instance_client = compute_v1.InstancesClient()
-            
-            # First, need to find the instance to get its zone
-            request = compute_v1.AggregatedListInstancesRequest(
-                project=self.project_id,
-                filter=f"id={instance_id}"
-            )
-            instances_iterator = instance_client.aggregated_list(request=request)
+    def update_resource_tags_bulk(
+        self,
+        items: List[Tuple[str, Dict[str, str]]],
+        max_workers: int = 16
+    ) -> Dict[str, bool]:
+        """
+        Update tags for many GCP resources, overlapping the label operations
+        
+        All SetLabels calls are started before any of them is waited on, so
+        relabeling N instances takes about as long as the slowest operation.
+        
+        Args:
+            items: List of (resource ID, tags) pairs
+            max_workers: Most label calls in flight at once
             
-            instance = None
-            zone = None
+        Returns:
+            Dict mapping resource ID to a boolean indicating success
+        """
+        results = {}
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Stage 1: start every instance label operation; buckets are patched synchronously
+            started = {}
+            for resource_id, tags in items:
+                if resource_id.isdigit():
+                    started[executor.submit(self._start_compute_instance_labels, resource_id, tags)] = resource_id
+                else:
+                    started[executor.submit(self._update_storage_bucket_labels, resource_id, tags)] = resource_id
             
-            for zone_path, response in instances_iterator:
-                if response.instances:
-                    # Found the instance
-                    instance = response.instances[0]
-                    zone = zone_path.split('/')[-1]
-                    break
+            # Stage 2: wait on the started operations concurrently
+            pending = {}
+            for future in as_completed(started):
+                resource_id = started[future]
+                try:
+                    operation = future.result()
+                except Exception as e:
+                    logger.error(f"Error updating labels for {resource_id}: {str(e)}")
+                    results[resource_id] = False
+                    continue
+                
+                if isinstance(operation, bool):
+                    results[resource_id] = operation
+                else:
+                    pending[executor.submit(operation.result)] = resource_id
             
-            if not instance or not zone:
-                logger.error(f"Instance {instance_id} not found")
+            for future in as_completed(pending):
+                resource_id = pending[future]
+                try:
+                    future.result()
+                    results[resource_id] = True
+                except Exception as e:
+                    logger.error(f"Error updating labels for {resource_id}: {str(e)}")
+                    results[resource_id] = False
+        
+        return results
+    
+    def _update_compute_instance_labels(self, instance_id: str, labels: Dict[str, str]) -> bool:
+        """Update labels for a compute instance"""
+        try:
+            operation = self._start_compute_instance_labels(instance_id, labels)
+            if operation is False:
                 return False
             
-            # Get current labels
-            current_labels = instance.labels or {}
-            
-            # Merge existing labels with new labels
-            merged_labels = {**current_labels, **labels}
-            
-            # Prepare the update request
-            request = compute_v1.SetLabelsInstanceRequest(
-                project=self.project_id,
-                zone=zone,
-                instance=instance.name,
-                instances_set_labels_request_resource=compute_v1.InstancesSetLabelsRequest(
-                    labels=merged_labels,
-                    label_fingerprint=instance.label_fingerprint
-                )
-            )
-            
-            # Apply the update
-            operation = instance_client.set_labels(request=request)
             operation.result()  # Wait for the operation to complete
             
             return True
@@ -235,11 +359,80 @@ class GCPConnector:
             logger.error(f"Error updating compute instance labels: {str(e)}")
             return False
     
+    def _find_compute_instance(self, instance_id: str) -> Tuple[Optional[compute_v1.Instance], Optional[str]]:
+        """
+        Find a compute instance and its zone
+        
+        Uses the zone recorded by the last scan when available, falling back
+        to a project-wide aggregated lookup.
+        
+        Returns:
+            Tuple of (instance, zone), or (None, None) if not found
+        """
+        instance_client = self.compute_client
+        
+        cached = self._instance_zone_cache.get(instance_id)
+        if cached:
+            zone, instance_name = cached
+            try:
+                instance = instance_client.get(project=self.project_id, zone=zone, instance=instance_name)
+                return instance, zone
+            except GoogleAPIError:
+                # Instance moved or was recreated since the last scan
+                self._instance_zone_cache.pop(instance_id, None)
+        
+        request = compute_v1.AggregatedListInstancesRequest(
+            project=self.project_id,
+            filter=f"id={instance_id}"
+        )
+        instances_iterator = instance_client.aggregated_list(request=request)
+        
+        for zone_path, response in instances_iterator:
+            if response.instances:
+                # Found the instance
+                instance = response.instances[0]
+                zone = zone_path.split('/')[-1]
+                self._instance_zone_cache[instance_id] = (zone, instance.name)
+                return instance, zone
+        
+        return None, None
+    
+    def _start_compute_instance_labels(self, instance_id: str, labels: Dict[str, str]):
+        """
+        Start a SetLabels operation on a compute instance without waiting for it
+        
+        Returns:
+            The SetLabels operation, or False if the instance was not found
+        """
+        instance, zone = self._find_compute_instance(instance_id)
+        
+        if not instance or not zone:
+            logger.error(f"Instance {instance_id} not found")
+            return False
+        
+        # Get current labels
+        current_labels = instance.labels or {}
+        
+        # Merge existing labels with new labels
+        merged_labels = {**current_labels, **labels}
+        
+        # Prepare the update request
+        request = compute_v1.SetLabelsInstanceRequest(
+            project=self.project_id,
+            zone=zone,
+            instance=instance.name,
+            instances_set_labels_request_resource=compute_v1.InstancesSetLabelsRequest(
+                labels=merged_labels,
+                label_fingerprint=instance.label_fingerprint
+            )
+        )
+        
+        return self.compute_client.set_labels(request=request)
+    
     def _update_storage_bucket_labels(self, bucket_name: str, labels: Dict[str, str]) -> bool:
         """Update labels for a storage bucket"""
         try:
-            # Create Storage client
-            storage_client = storage.Client()
+            storage_client = self.storage_client
             
             # Get the bucket
             bucket = storage_client.get_bucket(bucket_name)
@@ -0,0 +1,84 @@
+# core/cache.py
+"""
+Small in-process caching helpers shared across the API.
+"""
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+import os
+import threading
+import time
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a fixed time-to-live"""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a cached value
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss or an expired entry
+
+        Returns:
+            Cached value or default
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value, evicting the least recently used entry when full
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Optional time-to-live overriding the cache default
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """Remove a single entry if present"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self._lock:
+            self._data.clear()
+
+
+# GET /api/resources responses keyed by filter arguments and the generation below
+resource_list_cache = TTLCache(
+    maxsize=256,
+    ttl=float(os.getenv("RESOURCE_LIST_CACHE_TTL", "30"))
+)
+
+# Redis counter the worker increments whenever it writes resources; it is part of every
+# resource_list_cache key, so one write retires the cached lists of every API process
+RESOURCE_LIST_GENERATION_KEY = "cache:resources:generation"
+
+
+# How long the compiled list of active policies is reused before it is reloaded, and
+# so how long the worker can evaluate against policies edited through the API;
+# PolicyManager clears it early only in the process that wrote the policy
+ACTIVE_POLICIES_CACHE_TTL = float(os.getenv("ACTIVE_POLICIES_CACHE_TTL", "60"))
\ No newline at end of file
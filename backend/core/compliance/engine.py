@@ -2,108 +2,403 @@
 """
 Core compliance engine for evaluating and enforcing tag compliance across cloud providers.
 """
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Any
+import asyncio
+import csv
+import io
 import logging
+import os
+import sys
+from functools import cached_property
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
-from models.db import get_db
-from models.policy import Policy, PolicyModel
+import orjson
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+
+from models.db import AsyncSessionLocal, SessionLocal
 from models.resource import Resource, ResourceModel, ComplianceStatus
 from models.workflow import Workflow, WorkflowModel, WorkflowStatus, WorkflowType
+from core.compliance.policy import CompiledPolicy, PolicyManager
 from cloud.aws.connector import AWSConnector
 from cloud.azure.connector import AzureConnector
 from cloud.gcp.connector import GCPConnector
 
 logger = logging.getLogger(__name__)
 
+# Rows per INSERT ... ON CONFLICT statement when saving scanned resources on the async engine
+UPSERT_BATCH_SIZE = 1000
+
+# Session-local table scanned resources are copied into before being merged into resources
+RESOURCE_STAGING_TABLE = "resources_staging"
+
+_STAGING_COLUMNS = ("resource_id", "name", "resource_type", "cloud_provider", "region", "tags", "compliance_status")
+
+_CREATE_STAGING_TABLE = f"""
+    CREATE TEMP TABLE IF NOT EXISTS {RESOURCE_STAGING_TABLE} (
+        resource_id VARCHAR NOT NULL,
+        name VARCHAR NOT NULL,
+        resource_type VARCHAR NOT NULL,
+        cloud_provider VARCHAR NOT NULL,
+        region VARCHAR NOT NULL,
+        tags JSONB NOT NULL,
+        compliance_status VARCHAR(32),
+        seq BIGSERIAL
+    ) ON COMMIT DELETE ROWS
+"""
+
+_COPY_STAGING = f"""
+    COPY {RESOURCE_STAGING_TABLE} ({", ".join(_STAGING_COLUMNS)}) FROM STDIN
+    WITH (FORMAT csv, FORCE_NOT_NULL (resource_id, name, resource_type, cloud_provider, region))
+"""
+
+# Compliance status is only written for new rows; existing verdicts are left to evaluation.
+# A statement cannot update the same row twice, so only the last copy of each resource is kept.
+_MERGE_STAGING = f"""
+    INSERT INTO resources ({", ".join(_STAGING_COLUMNS)}, last_checked)
+    SELECT DISTINCT ON (resource_id) {", ".join(_STAGING_COLUMNS)}, %s FROM {RESOURCE_STAGING_TABLE}
+    ORDER BY resource_id, seq DESC
+    ON CONFLICT (resource_id) DO UPDATE SET
+        name = EXCLUDED.name,
+        resource_type = EXCLUDED.resource_type,
+        cloud_provider = EXCLUDED.cloud_provider,
+        region = EXCLUDED.region,
+        tags = EXCLUDED.tags,
+        last_checked = EXCLUDED.last_checked,
+        updated_at = now()
+"""
+
+# Rows fetched per server-side cursor batch, and changes flushed at a time, during evaluation
+EVALUATION_BATCH_SIZE = 1000
+
+# Concurrent tag update calls per provider in a batch remediation, so one large batch
+# cannot exceed a provider's API rate limits
+REMEDIATION_CONCURRENCY_PER_PROVIDER = int(os.getenv("REMEDIATION_CONCURRENCY_PER_PROVIDER", "8"))
+
+class _CsvRowReader:
+    """
+    File-like object that renders rows as CSV only as COPY reads them
+    
+    Lets COPY FROM STDIN consume a generator without the whole payload in memory.
+    
+    Args:
+        rows: Tuples of column values
+    """
+    
+    def __init__(self, rows: Iterator[tuple]):
+        self._rows = rows
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+        self._pending = ""
+        self.row_count = 0
+    
+    def read(self, size: int = -1) -> str:
+        """Return up to size characters of CSV, or everything left if size is negative"""
+        while size < 0 or len(self._pending) < size:
+            row = next(self._rows, None)
+            if row is None:
+                break
+            self._writer.writerow(row)
+            self.row_count += 1
+            self._pending += self._buffer.getvalue()
+            self._buffer.seek(0)
+            self._buffer.truncate()
+        
+        if size < 0:
+            data, self._pending = self._pending, ""
+        else:
+            data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
 class ComplianceEngine:
     """Core engine for evaluating and enforcing tag compliance across cloud providers"""
     
+    # Connector attribute for each supported provider name
+    _connectors = {
+        "aws": "aws_connector",
+        "azure": "azure_connector",
+        "gcp": "gcp_connector"
+    }
+    
     def __init__(self):
-        self.aws_connector = AWSConnector()
-        self.azure_connector = AzureConnector()
-        self.gcp_connector = GCPConnector()
+        self.policy_manager = PolicyManager()
+    
+    # Connectors are created on first use so unused providers never set up SDK sessions
+    @cached_property
+    def aws_connector(self) -> AWSConnector:
+        return AWSConnector()
+    
+    @cached_property
+    def azure_connector(self) -> AzureConnector:
+        return AzureConnector()
+    
+    @cached_property
+    def gcp_connector(self) -> GCPConnector:
+        return GCPConnector()
+        
+    def warm_up(self) -> None:
+        """
+        Create every provider's connector and SDK clients ahead of the first task
         
+        A provider that cannot be set up here is logged and left to fail on first use.
+        """
+        for provider in self._connectors:
+            try:
+                self.get_connector_for_provider(provider).warm_up()
+            except Exception as e:
+                logger.warning(f"Could not warm up {provider} connector: {str(e)}")
+    
     def get_connector_for_provider(self, cloud_provider: str):
         """Returns the appropriate cloud connector based on provider name"""
-        if cloud_provider.lower() == "aws":
-            return self.aws_connector
-        elif cloud_provider.lower() == "azure":
-            return self.azure_connector
-        elif cloud_provider.lower() == "gcp":
-            return self.gcp_connector
-        else:
+        try:
+            return getattr(self, self._connectors[cloud_provider.lower()])
+        except KeyError:
             raise ValueError(f"Unsupported cloud provider: {cloud_provider}")
     
-    def scan_resources(self, cloud_provider: str = None) -> List[Resource]:
+    def scan_resources(self, cloud_provider: str = None) -> int:
         """
-        Scan resources across specified cloud provider or all providers
+        Scan resources across specified cloud provider or all providers and save them
+        
+        Resources are streamed from the connectors straight into the database, so
+        memory use does not grow with the size of the account.
         
         Args:
             cloud_provider: Optional provider to scan (aws, azure, gcp). If None, scan all.
             
         Returns:
-            List of Resource objects representing cloud resources
+            Number of resources saved
         """
-        resources = []
+        count = self.bulk_insert_resources(self.iter_scanned_resources(cloud_provider))
+        
+        return count
+    
+    def iter_scanned_resources(self, cloud_provider: str = None) -> Iterator[Resource]:
+        """
+        Yield resources from the specified cloud provider or all providers as they are fetched
+        
+        When scanning all providers, one that fails is logged and skipped.
         
+        Args:
+            cloud_provider: Optional provider to scan (aws, azure, gcp). If None, scan all.
+            
+        Yields:
+            Resource objects representing cloud resources
+        """
         if cloud_provider:
-            # Scan specific provider
-            connector = self.get_connector_for_provider(cloud_provider)
-            provider_resources = connector.list_resources()
-            resources.extend(provider_resources)
-        else:
-            # Scan all providers
-            for provider in ["aws", "azure", "gcp"]:
-                try:
-                    connector = self.get_connector_for_provider(provider)
-                    provider_resources = connector.list_resources()
-                    resources.extend(provider_resources)
-                except Exception as e:
-                    logger.error(f"Error scanning {provider}: {str(e)}")
+            yield from self.get_connector_for_provider(cloud_provider).iter_resources()
+            return
+        
+        for provider in ["aws", "azure", "gcp"]:
+            try:
+                yield from self.get_connector_for_provider(provider).iter_resources()
+            except Exception as e:
+                logger.error(f"Error scanning {provider}: {str(e)}")
+    
+    def scan_slice(self, cloud_provider: str, resource_type: str, region: Optional[str] = None) -> int:
+        """
+        Scan one resource type of one provider and region and save the results
+        
+        Errors from the provider API propagate so the caller can retry the slice.
+        
+        Args:
+            cloud_provider: Provider to scan (aws, azure, gcp)
+            resource_type: Resource type from the connector's supported_resource_types
+            region: Region to scan, or None for providers scanned without regions
+            
+        Returns:
+            Number of resources found
+        """
+        connector = self.get_connector_for_provider(cloud_provider)
+        resources = connector.list_resource_slice(resource_type, region)
+        
+        return self.bulk_insert_resources(resources)
+    
+    async def scan_resources_async(self, cloud_provider: str = None) -> List[Resource]:
+        """
+        Scan resources without blocking the event loop
+        
+        Providers are listed concurrently through each connector's
+        list_resources_async, and the results are saved on the async engine.
+        
+        Args:
+            cloud_provider: Optional provider to scan (aws, azure, gcp). If None, scan all.
+            
+        Returns:
+            List of Resource objects representing cloud resources
+        """
+        providers = [cloud_provider] if cloud_provider else ["aws", "azure", "gcp"]
+        connectors = [self.get_connector_for_provider(provider) for provider in providers]
+        results = await asyncio.gather(
+            *(connector.list_resources_async() for connector in connectors),
+            return_exceptions=not cloud_provider
+        )
+        
+        resources = []
+        for provider, result in zip(providers, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error scanning {provider}: {str(result)}")
+            else:
+                resources.extend(result)
         
         # Save resources to database
-        db = next(get_db())
-        for resource in resources:
-            db_resource = ResourceModel(
-                resource_id=resource.resource_id,
-                name=resource.name,
-                resource_type=resource.resource_type,
-                cloud_provider=resource.cloud_provider,
-                region=resource.region,
-                tags=resource.tags,
-                compliance_status=resource.compliance_status,
-                last_checked=datetime.utcnow()
-            )
-            db.merge(db_resource)
-        db.commit()
+        async with AsyncSessionLocal() as db:
+            for stmt in self._upsert_statements(resources):
+                await db.execute(stmt)
+            await db.commit()
         
         return resources
     
-    def evaluate_compliance(self, resource: Resource, policies: List[Policy]) -> Tuple[bool, Dict[str, Any]]:
+    def bulk_insert_resources(self, resources: Iterable[Resource]) -> int:
+        """
+        Save scanned resources in a single transaction
+        
+        Args:
+            resources: Scanned resources
+            
+        Returns:
+            Number of distinct resources saved
+        """
+        with SessionLocal() as db:
+            count = self._upsert_resources(db, resources)
+            db.commit()
+        return count
+    
+    def _upsert_resources(self, db, resources: Iterable[Resource]) -> int:
+        """
+        Insert scanned resources, updating the inventory columns of ones already stored
+        
+        Rows are streamed with COPY into a temporary staging table and merged into
+        resources with one INSERT ... SELECT ... ON CONFLICT (resource_id) DO UPDATE,
+        so a scan costs two round trips however many resources it found. resources
+        may be a generator; it is consumed once, as COPY reads it.
+        
+        Args:
+            db: Database session
+            resources: Scanned resources
+            
+        Returns:
+            Number of distinct resources saved
+        """
+        reader = _CsvRowReader(
+            (
+                resource.resource_id,
+                resource.name,
+                resource.resource_type,
+                resource.cloud_provider,
+                resource.region,
+                orjson.dumps(resource.tags).decode(),
+                ComplianceStatus(resource.compliance_status).value
+            )
+            for resource in resources
+        )
+        
+        # Raw psycopg2 cursor on the session's connection, so the merge commits with the session
+        cursor = db.connection().connection.cursor()
+        try:
+            cursor.execute(_CREATE_STAGING_TABLE)
+            # The table outlives the transaction on a pooled connection; clear rows from an
+            # earlier call in this same transaction
+            cursor.execute(f"TRUNCATE {RESOURCE_STAGING_TABLE}")
+            cursor.copy_expert(_COPY_STAGING, reader)
+            if not reader.row_count:
+                return 0
+            cursor.execute(_MERGE_STAGING, (datetime.utcnow(),))
+            return cursor.rowcount
+        finally:
+            cursor.close()
+    
+    def _upsert_statements(self, resources: List[Resource]) -> Iterator:
+        """
+        Build the statements that save scanned resources
+        
+        Rows are written with INSERT ... ON CONFLICT (resource_id) DO UPDATE in
+        batches of UPSERT_BATCH_SIZE. Compliance status and details are left to
+        evaluation and are only set when a resource is first inserted.
+        
+        Args:
+            resources: Scanned resources
+            
+        Yields:
+            Insert statements, one per batch
+        """
+        now = datetime.utcnow()
+        
+        # A statement cannot update the same row twice, so keep the last copy of each resource
+        rows = list({
+            resource.resource_id: {
+                "resource_id": resource.resource_id,
+                "name": resource.name,
+                "resource_type": resource.resource_type,
+                "cloud_provider": resource.cloud_provider,
+                "region": resource.region,
+                "tags": resource.tags,
+                "compliance_status": resource.compliance_status,
+                "last_checked": now
+            }
+            for resource in resources
+        }.values())
+        
+        for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+            stmt = insert(ResourceModel).values(rows[start:start + UPSERT_BATCH_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[ResourceModel.resource_id],
+                set_={
+                    "name": stmt.excluded.name,
+                    "resource_type": stmt.excluded.resource_type,
+                    "cloud_provider": stmt.excluded.cloud_provider,
+                    "region": stmt.excluded.region,
+                    "tags": stmt.excluded.tags,
+                    "last_checked": stmt.excluded.last_checked,
+                    "updated_at": func.now()
+                }
+            )
+            yield stmt
+    
+    def evaluate_compliance(self, resource: Resource, policies: List[CompiledPolicy]) -> Tuple[bool, Dict[str, Any]]:
         """
         Evaluate if a resource complies with the given policies
         
         Args:
             resource: Resource to evaluate
-            policies: List of policies to check against
+            policies: List of compiled policies to check against
             
         Returns:
             Tuple of (is_compliant: bool, issues: Dict)
         """
         is_compliant = True
         issues = {}
+        tags = resource.tags or {}
+        
+        # Skip policies that don't apply to this resource type or provider
+        policies = [
+            policy for policy in policies
+            if not (policy.resource_types and resource.resource_type not in policy.resource_types)
+            and not (policy.cloud_providers and resource.cloud_provider not in policy.cloud_providers)
+        ]
+        
+        # Fast path: no allowed-value rules and every required tag present
+        if tags and not any(policy.restricts_values for policy in policies):
+            required_names = frozenset().union(*(policy.required_names for policy in policies))
+            if not required_names - tags.keys():
+                return True, {}
         
         for policy in policies:
-            # Skip policies that don't apply to this resource type or provider
-            if (policy.resource_types and resource.resource_type not in policy.resource_types) or \
-               (policy.cloud_providers and resource.cloud_provider not in policy.cloud_providers):
+            # Without tags every required tag is missing
+            if not tags:
+                if policy.required_tags:
+                    is_compliant = False
+                    issues.setdefault("missing_tags", []).extend(
+                        {"tag_name": tag.name, "policy_id": policy.id, "policy_name": policy.name}
+                        for tag in policy.required_tags
+                    )
                 continue
-                
+            
             # Check required tags
-            for required_tag in policy.required_tags:
-                tag_name = required_tag["name"]
-                if tag_name not in resource.tags:
+            for tag_name, allowed_set, allowed_values, _ in policy.required_tags:
+                if tag_name not in tags:
                     is_compliant = False
                     if "missing_tags" not in issues:
                         issues["missing_tags"] = []
@@ -112,136 +407,335 @@ class ComplianceEngine:
                         "policy_id": policy.id,
                         "policy_name": policy.name
                     })
-                elif "allowed_values" in required_tag and resource.tags[tag_name] not in required_tag["allowed_values"]:
+                elif allowed_set is not None and tags[tag_name] not in allowed_set:
                     is_compliant = False
                     if "invalid_tag_values" not in issues:
                         issues["invalid_tag_values"] = []
                     issues["invalid_tag_values"].append({
                         "tag_name": tag_name,
-                        "current_value": resource.tags[tag_name],
-                        "allowed_values": required_tag["allowed_values"],
+                        "current_value": tags[tag_name],
+                        "allowed_values": list(allowed_values),
                         "policy_id": policy.id,
                         "policy_name": policy.name
                     })
         
         return is_compliant, issues
     
-    def evaluate_all_resources(self) -> Dict[str, int]:
+    def _index_policies(self, policies: List[CompiledPolicy]) -> Dict[Tuple[Optional[str], Optional[str]], List[CompiledPolicy]]:
+        """
+        Group policies by the (cloud_provider, resource_type) pairs they apply to
+        
+        A policy without cloud_providers or resource_types is filed under None for
+        that part of the key, meaning it applies to any value.
+        
+        Args:
+            policies: Policies to index
+            
+        Returns:
+            Dict mapping (cloud_provider, resource_type) to policies
+        """
+        index = defaultdict(list)
+        
+        for policy in policies:
+            for cloud_provider in policy.cloud_providers or (None,):
+                for resource_type in policy.resource_types or (None,):
+                    index[(cloud_provider, resource_type)].append(policy)
+        
+        return index
+    
+    def _applicable_policies(
+        self,
+        policy_index: Dict[Tuple[Optional[str], Optional[str]], List[CompiledPolicy]],
+        cloud_provider: str,
+        resource_type: str
+    ) -> List[CompiledPolicy]:
+        """Collect the indexed policies that apply to a provider and resource type"""
+        return (
+            policy_index.get((cloud_provider, resource_type), []) +
+            policy_index.get((cloud_provider, None), []) +
+            policy_index.get((None, resource_type), []) +
+            policy_index.get((None, None), [])
+        )
+    
+    def scan_non_compliant(self) -> Dict[str, int]:
+        """
+        Re-evaluate only the resources that are not already compliant
+        
+        Returns:
+            Dict with compliance statistics for the re-evaluated resources
+        """
+        return self.evaluate_all_resources(non_compliant_only=True)
+    
+    def evaluate_resources(self, resource_ids: List[str]) -> Dict[str, int]:
+        """
+        Evaluate compliance for specific resources
+        
+        Args:
+            resource_ids: Cloud resource IDs to evaluate
+        
+        Returns:
+            Dict with compliance statistics for those resources
+        """
+        return self.evaluate_all_resources(resource_ids=resource_ids)
+    
+    def evaluate_all_resources(
+        self,
+        non_compliant_only: bool = False,
+        resource_ids: Optional[List[str]] = None
+    ) -> Dict[str, int]:
         """
         Evaluate compliance for all resources against all policies
         
+        Args:
+            non_compliant_only: Skip resources whose status is already compliant
+            resource_ids: Only evaluate these resources
+        
         Returns:
             Dict with compliance statistics
         """
-        db = next(get_db())
-        resources = db.query(ResourceModel).all()
-        policies = db.query(PolicyModel).filter(PolicyModel.active == True).all()
-        
-        compliant_count = 0
-        non_compliant_count = 0
-        
-        for resource_model in resources:
-            resource = Resource(
-                resource_id=resource_model.resource_id,
-                name=resource_model.name,
-                resource_type=resource_model.resource_type,
-                cloud_provider=resource_model.cloud_provider,
-                region=resource_model.region,
-                tags=resource_model.tags,
-                compliance_status=resource_model.compliance_status
-            )
+        with SessionLocal() as db:
+            query = db.query(ResourceModel)
+            if non_compliant_only:
+                query = query.filter(ResourceModel.compliance_status != ComplianceStatus.COMPLIANT)
+            if resource_ids is not None:
+                query = query.filter(ResourceModel.resource_id.in_(resource_ids))
             
-            is_compliant, issues = self.evaluate_compliance(resource, policies)
+            resources = query.execution_options(stream_results=True).yield_per(EVALUATION_BATCH_SIZE)
+            policies = self.policy_manager.get_active_policies()
             
-            # Update resource compliance status
-            resource_model.compliance_status = ComplianceStatus.COMPLIANT if is_compliant else ComplianceStatus.NON_COMPLIANT
-            resource_model.compliance_details = issues if not is_compliant else {}
-            resource_model.last_checked = datetime.utcnow()
+            policies_by_id = {policy.id: policy for policy in policies}
+            policy_index = self._index_policies(policies)
+            applicable_by_key = {}
+            workflow_rows = []
             
-            if is_compliant:
-                compliant_count += 1
-            else:
-                non_compliant_count += 1
+            total = 0
+            compliant_count = 0
+            non_compliant_count = 0
+            
+            for resource_model in resources:
+                total += 1
+                resource = Resource(
+                    resource_id=resource_model.resource_id,
+                    name=resource_model.name,
+                    resource_type=resource_model.resource_type,
+                    cloud_provider=resource_model.cloud_provider,
+                    region=resource_model.region,
+                    # Interned keys match the interned policy tag names by identity
+                    tags={sys.intern(k): v for k, v in (resource_model.tags or {}).items()},
+                    compliance_status=resource_model.compliance_status
+                )
                 
-                # Create remediation workflow if non-compliant
-                if issues:
-                    workflow = WorkflowModel(
-                        resource_id=resource.resource_id,
-                        workflow_type=WorkflowType.REMEDIATION,
-                        status=WorkflowStatus.PENDING,
-                        details={
-                            "issues": issues,
-                            "suggested_tags": self._generate_suggested_tags(resource, issues)
-                        },
-                        created_at=datetime.utcnow()
-                    )
-                    db.add(workflow)
-        
-        db.commit()
-        
-        return {
-            "total": len(resources),
-            "compliant": compliant_count,
-            "non_compliant": non_compliant_count,
-            "compliance_rate": (compliant_count / len(resources)) * 100 if resources else 0
-        }
+                key = (resource.cloud_provider, resource.resource_type)
+                applicable = applicable_by_key.get(key)
+                if applicable is None:
+                    applicable = applicable_by_key[key] = self._applicable_policies(policy_index, *key)
+                
+                is_compliant, issues = self.evaluate_compliance(resource, applicable)
+                
+                # Update resource compliance status
+                resource_model.compliance_status = ComplianceStatus.COMPLIANT if is_compliant else ComplianceStatus.NON_COMPLIANT
+                resource_model.compliance_details = issues if not is_compliant else {}
+                resource_model.last_checked = datetime.utcnow()
+                
+                if is_compliant:
+                    compliant_count += 1
+                else:
+                    non_compliant_count += 1
+                    
+                    # Create remediation workflow if non-compliant
+                    if issues:
+                        workflow_rows.append({
+                            "resource_id": resource.resource_id,
+                            "workflow_type": WorkflowType.REMEDIATION,
+                            "status": WorkflowStatus.PENDING,
+                            "details": {
+                                "issues": issues,
+                                "suggested_tags": self._generate_suggested_tags(resource, issues, policies_by_id)
+                            },
+                            "created_at": datetime.utcnow()
+                        })
+                
+                # Flush periodically so finished rows can be released from the session
+                if total % EVALUATION_BATCH_SIZE == 0:
+                    db.flush()
+                    if workflow_rows:
+                        db.bulk_insert_mappings(WorkflowModel, workflow_rows)
+                        workflow_rows = []
+            
+            if workflow_rows:
+                db.bulk_insert_mappings(WorkflowModel, workflow_rows)
+            
+            db.commit()
+            
+            return {
+                "total": total,
+                "compliant": compliant_count,
+                "non_compliant": non_compliant_count,
+                "compliance_rate": (compliant_count / total) * 100 if total else 0
+            }
     
-    def approve_remediation(self, workflow_id: int, approved_tags: Dict[str, str]) -> bool:
+    def approve_remediation(
+        self,
+        workflow_id: int,
+        approved_tags: Dict[str, str],
+        approved_by: Optional[str] = None
+    ) -> bool:
         """
         Apply approved remediation tags to a resource
         
         Args:
             workflow_id: ID of the remediation workflow
             approved_tags: Dict of tag names and values to apply
+            approved_by: User who approved the remediation, recorded on the workflow
             
         Returns:
             Boolean indicating success
         """
-        db = next(get_db())
-        workflow = db.query(WorkflowModel).filter(WorkflowModel.id == workflow_id).first()
-        
-        if not workflow or workflow.workflow_type != WorkflowType.REMEDIATION:
-            raise ValueError(f"Invalid remediation workflow ID: {workflow_id}")
-        
-        resource = db.query(ResourceModel).filter(ResourceModel.resource_id == workflow.resource_id).first()
-        
-        if not resource:
-            raise ValueError(f"Resource not found for workflow: {workflow_id}")
+        with SessionLocal() as db:
+            workflow = db.query(WorkflowModel).filter(WorkflowModel.id == workflow_id).first()
+            
+            if not workflow or workflow.workflow_type != WorkflowType.REMEDIATION:
+                raise ValueError(f"Invalid remediation workflow ID: {workflow_id}")
+            
+            resource = db.query(ResourceModel).filter(ResourceModel.resource_id == workflow.resource_id).first()
+            
+            if not resource:
+                raise ValueError(f"Resource not found for workflow: {workflow_id}")
+            
+            # Get the appropriate connector
+            connector = self.get_connector_for_provider(resource.cloud_provider)
+            
+            # Apply the tags
+            success = connector.update_resource_tags(resource.resource_id, approved_tags)
+            
+            if success:
+                # Update the resource tags in our database; assign a new dict so the change is persisted
+                resource.tags = {**(resource.tags or {}), **approved_tags}
+                
+                # Update workflow status
+                workflow.status = WorkflowStatus.COMPLETED
+                workflow.completed_at = datetime.utcnow()
+                workflow.details = {**(workflow.details or {}), "applied_tags": approved_tags}
+                if approved_by:
+                    workflow.approved_by = approved_by
+                
+                # Re-evaluate compliance
+                policies = self.policy_manager.get_active_policies()
+                resource_obj = Resource(
+                    resource_id=resource.resource_id,
+                    name=resource.name,
+                    resource_type=resource.resource_type,
+                    cloud_provider=resource.cloud_provider,
+                    region=resource.region,
+                    tags=resource.tags,
+                    compliance_status=resource.compliance_status
+                )
+                
+                is_compliant, issues = self.evaluate_compliance(resource_obj, policies)
+                resource.compliance_status = ComplianceStatus.COMPLIANT if is_compliant else ComplianceStatus.NON_COMPLIANT
+                resource.compliance_details = issues if not is_compliant else {}
+                
+                db.commit()
+            
+            return success
+    
+    def approve_remediation_batch(
+        self,
+        approvals: Dict[int, Dict[str, str]],
+        approved_by: Optional[str] = None
+    ) -> Dict[int, bool]:
+        """
+        Apply approved remediation tags for several workflows at once
         
-        # Get the appropriate connector
-        connector = self.get_connector_for_provider(resource.cloud_provider)
+        Each provider's tag updates go through its connector's update_resource_tags_bulk,
+        which uses the provider's multi-resource APIs where they exist. Providers run
+        concurrently, each with at most REMEDIATION_CONCURRENCY_PER_PROVIDER calls in
+        flight. Successful updates are re-evaluated and saved in a single commit.
         
-        # Apply the tags
-        success = connector.update_resource_tags(resource.resource_id, approved_tags)
+        Args:
+            approvals: Dict mapping workflow IDs to the tags approved for them
+            approved_by: User who approved the remediations, recorded on each workflow
+            
+        Returns:
+            Dict mapping each workflow ID to whether its tags were applied
+        """
+        results = {workflow_id: False for workflow_id in approvals}
+        if not approvals:
+            return results
         
-        if success:
-            # Update the resource tags in our database
-            resource.tags.update(approved_tags)
+        with SessionLocal() as db:
+            workflows = db.query(WorkflowModel).filter(
+                WorkflowModel.id.in_(list(approvals)),
+                WorkflowModel.workflow_type == WorkflowType.REMEDIATION
+            ).all()
+            resources = {
+                resource.resource_id: resource
+                for resource in db.query(ResourceModel).filter(
+                    ResourceModel.resource_id.in_([w.resource_id for w in workflows])
+                )
+            }
             
-            # Update workflow status
-            workflow.status = WorkflowStatus.COMPLETED
-            workflow.completed_at = datetime.utcnow()
-            workflow.details["applied_tags"] = approved_tags
-            
-            # Re-evaluate compliance
-            policies = db.query(PolicyModel).filter(PolicyModel.active == True).all()
-            resource_obj = Resource(
-                resource_id=resource.resource_id,
-                name=resource.name,
-                resource_type=resource.resource_type,
-                cloud_provider=resource.cloud_provider,
-                region=resource.region,
-                tags=resource.tags,
-                compliance_status=resource.compliance_status
-            )
+            # Group the updates by provider so each connector can batch them
+            groups = defaultdict(list)
+            for workflow in workflows:
+                resource = resources.get(workflow.resource_id)
+                if not resource:
+                    logger.warning(f"Resource not found for workflow: {workflow.id}")
+                    continue
+                groups[resource.cloud_provider].append((workflow, resource))
             
-            is_compliant, issues = self.evaluate_compliance(resource_obj, policies)
-            resource.compliance_status = ComplianceStatus.COMPLIANT if is_compliant else ComplianceStatus.NON_COMPLIANT
-            resource.compliance_details = issues if not is_compliant else {}
+            applied = []
+            with ThreadPoolExecutor(max_workers=len(groups) or 1) as executor:
+                futures = {}
+                for cloud_provider, items in groups.items():
+                    connector = self.get_connector_for_provider(cloud_provider)
+                    future = executor.submit(
+                        connector.update_resource_tags_bulk,
+                        [(resource.resource_id, approvals[workflow.id]) for workflow, resource in items],
+                        max_workers=REMEDIATION_CONCURRENCY_PER_PROVIDER
+                    )
+                    futures[future] = (cloud_provider, items)
+                
+                for future in as_completed(futures):
+                    cloud_provider, items = futures[future]
+                    try:
+                        results_by_resource = future.result()
+                    except Exception as e:
+                        logger.error(f"Error applying {cloud_provider} remediations: {str(e)}")
+                        continue
+                    
+                    for workflow, resource in items:
+                        if results_by_resource.get(resource.resource_id):
+                            applied.append((workflow, resource))
+            
+            if not applied:
+                return results
+            
+            # Re-evaluate every updated resource against the indexed active policies
+            policy_index = self._index_policies(self.policy_manager.get_active_policies())
+            completed_at = datetime.utcnow()
+            
+            for workflow, resource in applied:
+                approved_tags = approvals[workflow.id]
+                resource.tags = {**(resource.tags or {}), **approved_tags}
+                
+                workflow.status = WorkflowStatus.COMPLETED
+                workflow.completed_at = completed_at
+                workflow.details = {**(workflow.details or {}), "applied_tags": approved_tags}
+                if approved_by:
+                    workflow.approved_by = approved_by
+                
+                resource_obj = Resource.from_model(resource)
+                applicable = self._applicable_policies(policy_index, resource.cloud_provider, resource.resource_type)
+                is_compliant, issues = self.evaluate_compliance(resource_obj, applicable)
+                resource.compliance_status = ComplianceStatus.COMPLIANT if is_compliant else ComplianceStatus.NON_COMPLIANT
+                resource.compliance_details = issues if not is_compliant else {}
+                
+                results[workflow.id] = True
             
             db.commit()
         
-        return success
+        return results
     
     def reject_remediation(self, workflow_id: int, reason: str) -> bool:
         """
@@ -254,36 +748,38 @@ class ComplianceEngine:
         Returns:
             Boolean indicating success
         """
-        db = next(get_db())
-        workflow = db.query(WorkflowModel).filter(WorkflowModel.id == workflow_id).first()
-        
-        if not workflow or workflow.workflow_type != WorkflowType.REMEDIATION:
-            raise ValueError(f"Invalid remediation workflow ID: {workflow_id}")
-        
-        # Update workflow status
-        workflow.status = WorkflowStatus.REJECTED
-        workflow.completed_at = datetime.utcnow()
-        workflow.details["rejection_reason"] = reason
-        
-        db.commit()
-        return True
+        with SessionLocal() as db:
+            workflow = db.query(WorkflowModel).filter(WorkflowModel.id == workflow_id).first()
+            
+            if not workflow or workflow.workflow_type != WorkflowType.REMEDIATION:
+                raise ValueError(f"Invalid remediation workflow ID: {workflow_id}")
+            
+            # Update workflow status
+            workflow.status = WorkflowStatus.REJECTED
+            workflow.completed_at = datetime.utcnow()
+            workflow.details = {**(workflow.details or {}), "rejection_reason": reason}
+            
+            db.commit()
+            return True
     
-    def _generate_suggested_tags(self, resource: Resource, issues: Dict) -> Dict[str, str]:
+    def _generate_suggested_tags(
+        self,
+        resource: Resource,
+        issues: Dict,
+        policies_by_id: Dict[int, CompiledPolicy]
+    ) -> Dict[str, str]:
         """Generate suggested tag values for remediation"""
         suggested_tags = {}
         
         if "missing_tags" in issues:
             for missing_tag in issues["missing_tags"]:
                 # Get the policy to check for default values
-                db = next(get_db())
-                policy = db.query(PolicyModel).filter(PolicyModel.id == missing_tag["policy_id"]).first()
+                policy = policies_by_id.get(missing_tag["policy_id"])
+                if not policy:
+                    continue
                 
                 for required_tag in policy.required_tags:
-                    if required_tag["name"] == missing_tag["tag_name"]:
-                        if "default_value" in required_tag:
-                            suggested_tags[missing_tag["tag_name"]] = required_tag["default_value"]
-                        elif "allowed_values" in required_tag and required_tag["allowed_values"]:
-                            # Suggest the first allowed value
-                            suggested_tags[missing_tag["tag_name"]] = required_tag["allowed_values"][0]
-                        else:
-                            suggested_tags[missing_tag["tag_name"]] = ""
\ No newline at end of file
+                    if required_tag.name == missing_tag["tag_name"]:
+                        suggested_tags[required_tag.name] = required_tag.suggested_value
+        
+        return suggested_tags
\ No newline at end of file
@@ -2,36 +2,103 @@
 """
 Policy management module for handling tagging compliance policies.
 """
-from typing import Dict, List, Any, Optional
+from typing import Dict, FrozenSet, List, Any, NamedTuple, Optional, Tuple, Union
 import logging
+import sys
 from datetime import datetime
 
-from models.db import get_db
+from models.db import SessionLocal
 from models.policy import Policy, PolicyModel
+from core.cache import ACTIVE_POLICIES_CACHE_TTL, TTLCache
 
 logger = logging.getLogger(__name__)
 
+class RequiredTag(NamedTuple):
+    """A policy's required tag, normalized for evaluation"""
+    name: str
+    allowed_set: Optional[FrozenSet[str]]
+    allowed_values: Optional[Tuple[str, ...]]
+    suggested_value: Any
+
+class CompiledPolicy:
+    """
+    Read-only form of a policy used by the compliance engine
+    
+    Applicability filters are frozensets and each required tag is a RequiredTag, so
+    evaluation only does tuple unpacking and set membership checks. required_names
+    and restricts_values let evaluation settle the all-tags-present case with one
+    set difference.
+    
+    Args:
+        id: Policy ID
+        name: Policy name
+        required_tags: Normalized required tags
+        resource_types: Resource types the policy applies to; empty means all
+        cloud_providers: Cloud providers the policy applies to; empty means all
+    """
+    
+    __slots__ = (
+        "id", "name", "required_tags", "resource_types", "cloud_providers",
+        "required_names", "restricts_values"
+    )
+    
+    def __init__(
+        self,
+        id: int,
+        name: str,
+        required_tags: Tuple[RequiredTag, ...],
+        resource_types: FrozenSet[str],
+        cloud_providers: FrozenSet[str]
+    ):
+        self.id = id
+        self.name = name
+        self.required_tags = required_tags
+        self.resource_types = resource_types
+        self.cloud_providers = cloud_providers
+        self.required_names = frozenset(tag.name for tag in required_tags)
+        self.restricts_values = any(tag.allowed_set is not None for tag in required_tags)
+
+# Compiled policies keyed by (policy id, updated_at); the TTL only bounds how long
+# a policy edited outside the ORM can be evaluated in its old form
+_compiled_policies = TTLCache(maxsize=1024, ttl=3600)
+
+# Compiled active policies shared by every scan and remediation in this process.
+# Policy writes clear it only in the process that made them; the worker and other
+# API processes keep evaluating the old policies for up to ACTIVE_POLICIES_CACHE_TTL
+_active_policies = TTLCache(maxsize=1, ttl=ACTIVE_POLICIES_CACHE_TTL)
+
 class PolicyManager:
     """Manager for compliance policies"""
     
-    def get_policies(self, active_only: bool = False) -> List[Policy]:
+    def get_policies(
+        self,
+        active_only: bool = False,
+        skip: int = 0,
+        limit: Optional[int] = None
+    ) -> List[Policy]:
         """
         Get all policies
         
         Args:
             active_only: Only return active policies
+            skip: Number of records to skip (pagination)
+            limit: Maximum number of records to return, or None for all
             
         Returns:
             List of Policy objects
         """
-        db = next(get_db())
-        query = db.query(PolicyModel)
-        
-        if active_only:
-            query = query.filter(PolicyModel.active == True)
-        
-        policy_models = query.all()
-        return [Policy.from_model(p) for p in policy_models]
+        with SessionLocal() as db:
+            query = db.query(PolicyModel)
+            
+            if active_only:
+                query = query.filter(PolicyModel.active == True)
+            
+            query = query.order_by(PolicyModel.id).offset(skip)
+            if limit is not None:
+                query = query.limit(limit)
+            
+            policy_models = query.all()
+            return [Policy.from_model(p) for p in policy_models]
     
     def get_policy(self, policy_id: int) -> Optional[Policy]:
         """
@@ -43,13 +110,13 @@ class PolicyManager:
         Returns:
             Policy object or None if not found
         """
-        db = next(get_db())
-        policy_model = db.query(PolicyModel).filter(PolicyModel.id == policy_id).first()
-        
-        if not policy_model:
-            return None
-        
-        return Policy.from_model(policy_model)
+        with SessionLocal() as db:
+            policy_model = db.query(PolicyModel).filter(PolicyModel.id == policy_id).first()
+            
+            if not policy_model:
+                return None
+            
+            return Policy.from_model(policy_model)
     
     def create_policy(self, policy_data: Dict[str, Any]) -> Policy:
         """
@@ -61,26 +128,26 @@ class PolicyManager:
         Returns:
             Created Policy object
         """
-        db = next(get_db())
-        
         # Validate required tags format
-        self._validate_required_tags(policy_data.get("required_tags", []))
-        
-        # Create policy model
-        policy_model = PolicyModel(
-            name=policy_data["name"],
-            description=policy_data.get("description"),
-            active=policy_data.get("active", True),
-            required_tags=policy_data["required_tags"],
-            resource_types=policy_data.get("resource_types"),
-            cloud_providers=policy_data.get("cloud_providers")
-        )
-        
-        db.add(policy_model)
-        db.commit()
-        db.refresh(policy_model)
-        
-        return Policy.from_model(policy_model)
+        required_tags = self._validate_required_tags(policy_data.get("required_tags", []))
+        
+        with SessionLocal() as db:
+            # Create policy model
+            policy_model = PolicyModel(
+                name=policy_data["name"],
+                description=policy_data.get("description"),
+                active=policy_data.get("active", True),
+                required_tags=required_tags,
+                resource_types=_unique(policy_data.get("resource_types")),
+                cloud_providers=_unique(policy_data.get("cloud_providers"))
+            )
+            
+            db.add(policy_model)
+            db.commit()
+            db.refresh(policy_model)
+            _active_policies.clear()
+            
+            return Policy.from_model(policy_model)
     
     def update_policy(self, policy_id: int, policy_data: Dict[str, Any]) -> Optional[Policy]:
         """
@@ -93,25 +160,30 @@ class PolicyManager:
         Returns:
             Updated Policy object or None if not found
         """
-        db = next(get_db())
-        policy_model = db.query(PolicyModel).filter(PolicyModel.id == policy_id).first()
-        
-        if not policy_model:
-            return None
-        
-        # Validate required tags if provided
-        if "required_tags" in policy_data:
-            self._validate_required_tags(policy_data["required_tags"])
-        
-        # Update fields
-        for key, value in policy_data.items():
-            if hasattr(policy_model, key):
-                setattr(policy_model, key, value)
-        
-        db.commit()
-        db.refresh(policy_model)
-        
-        return Policy.from_model(policy_model)
+        with SessionLocal() as db:
+            policy_model = db.query(PolicyModel).filter(PolicyModel.id == policy_id).first()
+            
+            if not policy_model:
+                return None
+            
+            # Validate required tags if provided
+            policy_data = dict(policy_data)
+            if "required_tags" in policy_data:
+                policy_data["required_tags"] = self._validate_required_tags(policy_data["required_tags"])
+            for key in ("resource_types", "cloud_providers"):
+                if key in policy_data:
+                    policy_data[key] = _unique(policy_data[key])
+            
+            # Update fields
+            for key, value in policy_data.items():
+                if hasattr(policy_model, key):
+                    setattr(policy_model, key, value)
+            
+            db.commit()
+            db.refresh(policy_model)
+            _active_policies.clear()
+            
+            return Policy.from_model(policy_model)
     
     def delete_policy(self, policy_id: int) -> bool:
         """
@@ -123,30 +195,102 @@ class PolicyManager:
         Returns:
             Boolean indicating success
         """
-        db = next(get_db())
-        policy_model = db.query(PolicyModel).filter(PolicyModel.id == policy_id).first()
+        with SessionLocal() as db:
+            policy_model = db.query(PolicyModel).filter(PolicyModel.id == policy_id).first()
+            
+            if not policy_model:
+                return False
+            
+            db.delete(policy_model)
+            db.commit()
+            _active_policies.clear()
+            
+            return True
+    
+    def get_active_policies(self) -> List[CompiledPolicy]:
+        """
+        Get the compiled active policies, reloading them at most every ACTIVE_POLICIES_CACHE_TTL seconds
+        
+        A policy written by another process is picked up once this process's copy expires.
         
-        if not policy_model:
-            return False
+        Returns:
+            List of CompiledPolicy objects ordered by policy ID
+        """
+        policies = _active_policies.get("active")
         
-        db.delete(policy_model)
-        db.commit()
+        if policies is None:
+            with SessionLocal() as db:
+                policy_models = db.query(PolicyModel).filter(PolicyModel.active == True).order_by(PolicyModel.id)
+                policies = [self.compile_policy(p) for p in policy_models]
+            _active_policies.set("active", policies)
         
-        return True
+        return policies
     
-    def _validate_required_tags(self, required_tags: List[Dict[str, Any]]) -> None:
+    def compile_policy(self, policy: Union[PolicyModel, Policy]) -> CompiledPolicy:
         """
-        Validate the required tags format
+        Get the compiled form of a policy, reusing it until the policy is updated
+        
+        Args:
+            policy: Policy model or business object
+            
+        Returns:
+            CompiledPolicy for the policy
+        """
+        key = (policy.id, policy.updated_at)
+        compiled = _compiled_policies.get(key)
+        
+        if compiled is None:
+            required_tags = []
+            for tag in policy.required_tags:
+                allowed_values = tuple(tag["allowed_values"]) if tag.get("allowed_values") else None
+                
+                if "default_value" in tag:
+                    suggested_value = tag["default_value"]
+                elif allowed_values:
+                    # Suggest the first allowed value
+                    suggested_value = allowed_values[0]
+                else:
+                    suggested_value = ""
+                
+                required_tags.append(RequiredTag(
+                    # Interned so tag lookups against interned resource keys compare by identity
+                    name=sys.intern(tag["name"]),
+                    allowed_set=frozenset(allowed_values) if allowed_values else None,
+                    allowed_values=allowed_values,
+                    suggested_value=suggested_value
+                ))
+            
+            compiled = CompiledPolicy(
+                id=policy.id,
+                name=policy.name,
+                required_tags=tuple(required_tags),
+                resource_types=frozenset(policy.resource_types or ()),
+                cloud_providers=frozenset(policy.cloud_providers or ())
+            )
+            _compiled_policies.set(key, compiled)
+        
+        return compiled
+    
+    def _validate_required_tags(self, required_tags: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Validate the required tags format and drop duplicate allowed values
+        
+        compile_policy turns the stored lists into frozensets once per policy version,
+        when the policy loads.
         
         Args:
             required_tags: List of required tag dictionaries
             
+        Returns:
+            Required tags with each allowed_values list de-duplicated in order
+            
         Raises:
             ValueError: If the required tags format is invalid
         """
         if not isinstance(required_tags, list):
             raise ValueError("required_tags must be a list")
         
+        normalized = []
         for tag in required_tags:
             if not isinstance(tag, dict):
                 raise ValueError("Each required tag must be a dictionary")
@@ -156,4 +300,19 @@ class PolicyManager:
             
             if "allowed_values" in tag and tag["allowed_values"] is not None:
                 if not isinstance(tag["allowed_values"], list):
-                    raise ValueError("allowed_values must be a list")
\ No newline at end of file
+                    raise ValueError("allowed_values must be a list")
+                tag = {**tag, "allowed_values": _unique(tag["allowed_values"])}
+            
+            normalized.append(tag)
+        
+        return normalized
+
+def _unique(values: Optional[List[Any]]) -> Optional[List[Any]]:
+    """Drop repeated values from a stored list, keeping the first occurrence's order"""
+    if values is None:
+        return None
+    # Unhashable values cannot be de-duplicated; store them as given
+    try:
+        return list(dict.fromkeys(values))
+    except TypeError:
+        return list(values)
\ No newline at end of file
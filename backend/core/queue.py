@@ -0,0 +1,218 @@
+# core/queue.py
+"""
+Client for dispatching long-running jobs to the Celery worker.
+"""
+from typing import Any, Dict, List, Optional
+import hashlib
+import json
+import os
+
+import redis
+from celery import Celery
+from celery.result import AsyncResult
+
+from core.cache import RESOURCE_LIST_GENERATION_KEY
+
+# Same broker settings as worker/scheduler.py
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
+CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/0")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# Approved tags are stored under this prefix plus their SHA-256 and only the hash is
+# sent with the task; worker/tasks/remediation.py reads the same keys
+REMEDIATION_TAGS_PREFIX = "rem:tags:"
+# Seconds stored tags are kept for a queued remediation to pick up
+REMEDIATION_TAGS_TTL = 86400
+
+# Task names registered by the worker
+SCAN_RESOURCES_TASK = 'worker.tasks.scanner.scan_resources_task'
+EVALUATE_COMPLIANCE_TASK = 'worker.tasks.evaluator.evaluate_compliance_task'
+APPLY_REMEDIATION_TASK = 'worker.tasks.remediation.apply_remediation_task'
+APPLY_REMEDIATION_BATCH_TASK = 'worker.tasks.remediation.apply_remediation_batch_task'
+
+# Queues the worker consumes, as routed below
+TASK_QUEUES = ('scan', 'eval', 'remediate')
+
+# Producer-only app; tasks are sent by name so worker code is not imported
+celery_app = Celery(
+    'cloud_compliance_api',
+    broker=CELERY_BROKER_URL,
+    backend=CELERY_RESULT_BACKEND
+)
+
+celery_app.conf.update(
+    # msgpack payloads are smaller and faster to encode; json is still accepted so
+    # messages queued before the switch are consumed during a rollout
+    task_serializer='msgpack',
+    accept_content=['msgpack', 'json'],
+    result_serializer='msgpack',
+    result_accept_content=['msgpack', 'json'],
+    # zstd-compress message bodies and stored results; consumers detect the
+    # compression per message, so uncompressed ones are still read
+    task_compression='zstd',
+    result_compression='zstd',
+    timezone='UTC',
+    enable_utc=True,
+    # Same routing as worker/scheduler.py so jobs reach the queue their workers consume
+    task_routes={
+        'worker.tasks.scanner.*': {'queue': 'scan'},
+        'worker.tasks.evaluator.*': {'queue': 'eval'},
+        'worker.tasks.remediation.*': {'queue': 'remediate'},
+    },
+    task_default_queue='scan',
+)
+
+def enqueue_scan(cloud_provider: Optional[str] = None) -> str:
+    """
+    Queue a resource scan on the worker
+    
+    The job splits the scan into slices and finishes once they are queued; its
+    result carries a scan_id whose job holds the totals after every slice has run.
+    
+    Args:
+        cloud_provider: Optional provider to scan (aws, azure, gcp). If None, scan all.
+    
+    Returns:
+        Job ID
+    """
+    result = celery_app.send_task(SCAN_RESOURCES_TASK, args=(cloud_provider,))
+    return result.id
+
+def enqueue_evaluation() -> str:
+    """
+    Queue a compliance evaluation of all resources on the worker
+    
+    Returns:
+        Job ID
+    """
+    result = celery_app.send_task(EVALUATE_COMPLIANCE_TASK)
+    return result.id
+
+_redis_client: Optional[redis.Redis] = None
+
+def _get_redis() -> redis.Redis:
+    """Get the Redis client for stored task payloads, creating it on first use"""
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(REDIS_URL)
+    return _redis_client
+
+def get_resource_list_generation() -> Optional[bytes]:
+    """
+    Get the current generation of the resource list cache
+    
+    Returns:
+        Generation counter, or None if Redis is unavailable and cached lists
+        cannot be trusted
+    """
+    try:
+        return _get_redis().get(RESOURCE_LIST_GENERATION_KEY) or b"0"
+    except redis.RedisError:
+        return None
+
+def _store_tags(tag_sets: List[Dict[str, str]]) -> List[str]:
+    """
+    Store tag sets in Redis under their content hashes
+    
+    Args:
+        tag_sets: Tag sets to store
+    
+    Returns:
+        SHA-256 of each tag set, in the same order
+    """
+    payloads = {}
+    shas = []
+    for approved_tags in tag_sets:
+        # Canonical encoding, so equal tag sets hash and store the same
+        payload = json.dumps(approved_tags, sort_keys=True, separators=(",", ":")).encode()
+        tags_sha = hashlib.sha256(payload).hexdigest()
+        payloads[tags_sha] = payload
+        shas.append(tags_sha)
+    
+    with _get_redis().pipeline(transaction=False) as pipe:
+        for tags_sha, payload in payloads.items():
+            pipe.set(f"{REMEDIATION_TAGS_PREFIX}{tags_sha}", payload, ex=REMEDIATION_TAGS_TTL)
+        pipe.execute()
+    
+    return shas
+
+def enqueue_remediation(workflow_id: int, approved_tags: Dict[str, str], approved_by: Optional[str] = None) -> str:
+    """
+    Queue a remediation on the worker
+    
+    The tags are stored in Redis under their content hash and the task carries only
+    the hash, so its message stays small however many tags are approved, and
+    identical tag sets share one stored copy.
+    
+    Args:
+        workflow_id: ID of the remediation workflow
+        approved_tags: Dict of tag names and values to apply
+        approved_by: User who approved the remediation
+    
+    Returns:
+        Job ID
+    """
+    tags_sha, = _store_tags([approved_tags])
+    result = celery_app.send_task(APPLY_REMEDIATION_TASK, args=(workflow_id, tags_sha, approved_by))
+    return result.id
+
+def enqueue_remediation_batch(approvals: Dict[int, Dict[str, str]], approved_by: Optional[str] = None) -> str:
+    """
+    Queue several remediations on the worker as one job
+    
+    Each distinct tag set is stored once, as in enqueue_remediation, and the worker
+    applies the whole batch through the connectors' bulk tagging APIs.
+    
+    Args:
+        approvals: Dict mapping workflow IDs to the tags approved for them
+        approved_by: User who approved the remediations
+    
+    Returns:
+        Job ID
+    """
+    workflow_ids = list(approvals)
+    shas = _store_tags([approvals[workflow_id] for workflow_id in workflow_ids])
+    # Pairs rather than a dict, so integer workflow IDs survive the JSON serializer
+    pairs = [[workflow_id, tags_sha] for workflow_id, tags_sha in zip(workflow_ids, shas)]
+    
+    result = celery_app.send_task(APPLY_REMEDIATION_BATCH_TASK, args=(pairs, approved_by))
+    return result.id
+
+def get_queue_depths() -> Dict[str, int]:
+    """
+    Get the number of tasks waiting in each worker queue
+    
+    The Redis broker keeps each queue as a list named after it, so this is one LLEN
+    per queue; autoscalers size each queue's worker fleet from these numbers.
+    
+    Returns:
+        Dict mapping queue name to waiting tasks
+    """
+    broker = redis.Redis.from_url(CELERY_BROKER_URL)
+    try:
+        with broker.pipeline(transaction=False) as pipe:
+            for queue in TASK_QUEUES:
+                pipe.llen(queue)
+            return dict(zip(TASK_QUEUES, pipe.execute()))
+    finally:
+        broker.close()
+
+def get_job_status(job_id: str) -> Dict[str, Any]:
+    """
+    Get the state of a queued job
+    
+    Args:
+        job_id: Job ID returned when the job was queued
+    
+    Returns:
+        Dict with job state and, once finished, its result
+    """
+    result = AsyncResult(job_id, app=celery_app)
+    status = {"job_id": job_id, "state": result.state}
+    
+    if result.successful():
+        status["result"] = result.result
+    elif result.failed():
+        status["error"] = str(result.result)
+    
+    return status
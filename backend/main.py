@@ -1,7 +1,9 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import text
 import os
-import psycopg2
+
+from models.db import AsyncSessionLocal
 
 app = FastAPI()
 
@@ -14,7 +16,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-DATABASE_URL = os.getenv("DATABASE_URL")
 REDIS_URL = os.getenv("REDIS_URL")
 KEYCLOAK_URL = os.getenv("KEYCLOAK_URL")
 MINIO_URL = os.getenv("MINIO_URL")
@@ -26,11 +27,12 @@ def read_root():
     return {"message": "FinOps Backend Running"}
 
 @app.get("/health")
-def health_check():
+async def health_check():
     # Simple health check example for DB connection
     try:
-        conn = psycopg2.connect(DATABASE_URL)
-        conn.close()
+        # Borrow a pooled connection rather than opening a new one per probe
+        async with AsyncSessionLocal() as session:
+            await session.execute(text("SELECT 1"))
         return {"status": "ok", "db": "connected"}
     except Exception as e:
         return {"status": "error", "db_error": str(e)}
\ No newline at end of file
@@ -1,8 +1,9 @@
 # models/policy.py
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 import enum
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, FrozenSet, Optional
 from datetime import datetime
 
 from models.db import Base
@@ -14,10 +15,10 @@ class PolicyModel(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     description = Column(String, nullable=True)
-    active = Column(Boolean, default=True)
-    required_tags = Column(JSON, nullable=False)  # List of required tags with validation rules
-    resource_types = Column(JSON, nullable=True)  # Optional list of applicable resource types
-    cloud_providers = Column(JSON, nullable=True)  # Optional list of applicable cloud providers
+    active = Column(Boolean, default=True, index=True)
+    required_tags = Column(JSONB, nullable=False)  # List of required tags with validation rules
+    resource_types = Column(JSONB, nullable=True)  # Optional list of applicable resource types
+    cloud_providers = Column(JSONB, nullable=True)  # Optional list of applicable cloud providers
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -31,8 +32,8 @@ class Policy:
         description: Optional[str],
         active: bool,
         required_tags: List[Dict[str, Any]],
-        resource_types: Optional[List[str]] = None,
-        cloud_providers: Optional[List[str]] = None,
+        resource_types: Optional[FrozenSet[str]] = None,
+        cloud_providers: Optional[FrozenSet[str]] = None,
         created_at: Optional[datetime] = None,
         updated_at: Optional[datetime] = None
     ):
@@ -55,8 +56,9 @@ class Policy:
             description=model.description,
             active=model.active,
             required_tags=model.required_tags,
-            resource_types=model.resource_types,
-            cloud_providers=model.cloud_providers,
+            # Frozensets make applicability checks hash lookups
+            resource_types=frozenset(model.resource_types) if model.resource_types else None,
+            cloud_providers=frozenset(model.cloud_providers) if model.cloud_providers else None,
             created_at=model.created_at,
             updated_at=model.updated_at
         )
\ No newline at end of file
@@ -1,11 +1,15 @@
 # models/resource.py
-from sqlalchemy import Column, Integer, String, DateTime, JSON, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 import enum
-from typing import Dict, Optional
+from typing import Any, Dict, Literal, Optional
 from datetime import datetime
 
-from models.db import Base
+from models.db import Base, EnumStr
+
+# Supported cloud provider names
+CloudProvider = Literal["aws", "azure", "gcp"]
 
 class ComplianceStatus(enum.Enum):
     """Enumeration of possible compliance statuses"""
@@ -17,16 +21,22 @@ class ComplianceStatus(enum.Enum):
 class ResourceModel(Base):
     """SQLAlchemy model for cloud resources"""
     __tablename__ = "resources"
+    __table_args__ = (
+        # Serves the has_key (?) operator used by tag filters
+        Index("idx_resources_tags", "tags", postgresql_using="gin"),
+        # Serves provider and resource type filters used together
+        Index("idx_resources_provider_type", "cloud_provider", "resource_type"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     resource_id = Column(String, unique=True, index=True, nullable=False)
     name = Column(String, nullable=False)
-    resource_type = Column(String, nullable=False)
-    cloud_provider = Column(String, nullable=False)
-    region = Column(String, nullable=False)
-    tags = Column(JSON, nullable=False, default={})
-    compliance_status = Column(Enum(ComplianceStatus), default=ComplianceStatus.UNKNOWN)
-    compliance_details = Column(JSON, nullable=True)
+    resource_type = Column(String, nullable=False, index=True)
+    cloud_provider = Column(String, nullable=False, index=True)
+    region = Column(String, nullable=False, index=True)
+    tags = Column(JSONB, nullable=False, default={})
+    compliance_status = Column(EnumStr(ComplianceStatus), default=ComplianceStatus.UNKNOWN, index=True)
+    compliance_details = Column(JSONB, nullable=True)
     last_checked = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -34,6 +44,15 @@ class ResourceModel(Base):
 class Resource:
     """Business model for cloud resources"""
     
+    # Attributes shared with ResourceModel, in serialization order
+    FIELDS = (
+        "id", "resource_id", "name", "resource_type", "cloud_provider", "region", "tags",
+        "compliance_status", "compliance_details", "last_checked", "created_at", "updated_at"
+    )
+    
+    # Scans build one instance per cloud resource; slots drop the per-instance __dict__
+    __slots__ = FIELDS
+    
     def __init__(
         self,
         resource_id: str,
@@ -78,4 +97,16 @@ class Resource:
             last_checked=model.last_checked,
             created_at=model.created_at,
             updated_at=model.updated_at
-        )
\ No newline at end of file
+        )
+    
+    @classmethod
+    def dict_from_model(cls, model: ResourceModel) -> Dict[str, Any]:
+        """Serialize a SQLAlchemy model directly, without building a business model"""
+        data = {field: getattr(model, field) for field in cls.FIELDS}
+        data["tags"] = data["tags"] or {}
+        data["compliance_details"] = data["compliance_details"] or {}
+        return data
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dict suitable for JSON serialization"""
+        return {field: getattr(self, field) for field in self.FIELDS}
\ No newline at end of file
@@ -1,11 +1,12 @@
 # models/workflow.py
-from sqlalchemy import Column, Integer, String, DateTime, JSON, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 import enum
 from typing import Dict, Optional, Any
 from datetime import datetime
 
-from models.db import Base
+from models.db import Base, EnumStr
 
 class WorkflowType(enum.Enum):
     """Enumeration of workflow types"""
@@ -26,18 +27,37 @@ class WorkflowModel(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     resource_id = Column(String, nullable=False, index=True)
-    workflow_type = Column(Enum(WorkflowType), nullable=False)
-    status = Column(Enum(WorkflowStatus), default=WorkflowStatus.PENDING)
-    details = Column(JSON, nullable=True)
+    workflow_type = Column(EnumStr(WorkflowType), nullable=False)
+    status = Column(EnumStr(WorkflowStatus), default=WorkflowStatus.PENDING)
+    details = Column(JSONB, nullable=True)
     created_by = Column(String, nullable=True)
     approved_by = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True)
+    
+    __table_args__ = (
+        # Covers list_workflows filters ordered by recency
+        Index(
+            "idx_workflows_status_type_created",
+            status,
+            workflow_type,
+            created_at.desc(),
+            postgresql_include=["resource_id"]
+        ),
+        # Serves the unfiltered "recent workflows" query in get_workflow_stats
+        Index("idx_workflows_created_at", created_at.desc()),
+    )
 
 class Workflow:
     """Business model for compliance workflows"""
     
+    # Attributes shared with WorkflowModel, in serialization order
+    FIELDS = (
+        "id", "resource_id", "workflow_type", "status", "details", "created_by",
+        "approved_by", "created_at", "updated_at", "completed_at"
+    )
+    
     def __init__(
         self,
         id: Optional[int],
@@ -76,4 +96,15 @@ class Workflow:
             created_at=model.created_at,
             updated_at=model.updated_at,
             completed_at=model.completed_at
-        )
\ No newline at end of file
+        )
+    
+    @classmethod
+    def dict_from_model(cls, model: WorkflowModel) -> Dict[str, Any]:
+        """Serialize a SQLAlchemy model directly, without building a business model"""
+        data = {field: getattr(model, field) for field in cls.FIELDS}
+        data["details"] = data["details"] or {}
+        return data
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dict suitable for JSON serialization"""
+        return {field: getattr(self, field) for field in self.FIELDS}
\ No newline at end of file
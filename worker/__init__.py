@@ -0,0 +1,16 @@
+# worker/__init__.py
+"""
+Cloud compliance worker package.
+
+With CELERY_POOL=gevent the standard library and psycopg2 are patched here, before
+Celery, the cloud SDKs or the database driver are imported, so their blocking I/O
+yields to other greenlets.
+"""
+import os
+
+if os.getenv("CELERY_POOL", "prefork") == "gevent":
+    from gevent import monkey
+    monkey.patch_all()
+    
+    from psycogreen.gevent import patch_psycopg
+    patch_psycopg()
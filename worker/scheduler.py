@@ -10,15 +10,41 @@ import os
 from celery import Celery
 from celery.schedules import crontab
 
-from worker.tasks.scanner import scan_resources_task
+from worker.tasks.scanner import (
+    scan_resources_task,
+    scan_aws_task,
+    scan_azure_task,
+    scan_gcp_task,
+    scan_slice_task,
+    aggregate_scan_task,
+    scan_failed_task,
+    RETRYABLE_SCAN_ERRORS
+)
 from worker.tasks.evaluator import evaluate_compliance_task
-from worker.tasks.remediation import apply_remediation_task
+from worker.tasks.remediation import apply_remediation_task, apply_remediation_batch_task
+from worker.tasks.ingest import ingest_cloud_data_task
 
 logger = logging.getLogger(__name__)
 
 # Get Celery configuration from environment variables
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/0")
+# Tasks each worker process reserves ahead; scans and remediations run for minutes,
+# so reserving more leaves queued tasks waiting behind a busy process
+CELERY_PREFETCH_MULTIPLIER = int(os.getenv("CELERY_PREFETCH_MULTIPLIER", "1"))
+# Execution pool; the tasks mostly wait on cloud APIs and the database, so gevent can
+# run hundreds of them in one process (see worker/__init__.py for the monkey patching)
+CELERY_POOL = os.getenv("CELERY_POOL", "prefork")
+# Greenlets are cheap, so a gevent pool runs far more tasks than prefork has processes
+CELERY_CONCURRENCY = int(os.getenv("CELERY_CONCURRENCY", "200" if CELERY_POOL == "gevent" else "0")) or None
+# Seconds before a task is asked to stop (soft) and then killed (hard), so a hung
+# cloud SDK socket cannot hold a worker slot indefinitely
+TASK_SOFT_LIMIT = int(os.getenv("TASK_SOFT_LIMIT", "1500"))
+TASK_HARD_LIMIT = int(os.getenv("TASK_HARD_LIMIT", "1800"))
+# Recycle a prefork child after this many tasks or once its resident memory passes this
+# many KiB, so slow leaks in the cloud SDKs cannot grow until the pod is OOM-killed
+MAX_TASKS_PER_CHILD = int(os.getenv("MAX_TASKS_PER_CHILD", "200"))
+MAX_MEMORY_PER_CHILD_KB = int(os.getenv("MAX_MEMORY_PER_CHILD_KB", "512000"))
 
 # Configure Celery
 app = Celery(
@@ -29,11 +55,40 @@ app = Celery(
 
 # Set additional configuration
 app.conf.update(
-    task_serializer='json',
-    accept_content=['json'],
-    result_serializer='json',
+    # msgpack payloads are smaller and faster to encode; json is still accepted so
+    # messages queued before the switch are consumed during a rollout
+    task_serializer='msgpack',
+    accept_content=['msgpack', 'json'],
+    result_serializer='msgpack',
+    result_accept_content=['msgpack', 'json'],
+    # zstd-compress message bodies and stored results; consumers detect the
+    # compression per message, so uncompressed ones are still read
+    task_compression='zstd',
+    result_compression='zstd',
     timezone='UTC',
     enable_utc=True,
+    worker_prefetch_multiplier=CELERY_PREFETCH_MULTIPLIER,
+    worker_pool=CELERY_POOL,
+    worker_concurrency=CELERY_CONCURRENCY,
+    worker_max_tasks_per_child=MAX_TASKS_PER_CHILD,
+    worker_max_memory_per_child=MAX_MEMORY_PER_CHILD_KB,
+    # Acknowledge after the task finishes so a crashed worker's task is redelivered
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    task_soft_time_limit=TASK_SOFT_LIMIT,
+    task_time_limit=TASK_HARD_LIMIT,
+    # Separate queues per workload so hourly scans cannot delay a remediation approval
+    task_routes={
+        'worker.tasks.scanner.*': {'queue': 'scan'},
+        'worker.tasks.ingest.*': {'queue': 'scan'},
+        'worker.tasks.evaluator.*': {'queue': 'eval'},
+        'worker.tasks.remediation.*': {'queue': 'remediate'},
+    },
+    task_default_queue='scan',
+    # Most tasks run on the beat schedule and nobody reads their return value; tasks
+    # whose results are needed opt back in with ignore_result=False
+    task_ignore_result=True,
+    result_expires=3600,
 )
 
 # Configure periodic tasks
@@ -42,40 +97,109 @@ app.conf.beat_schedule = {
         'task': 'worker.tasks.scanner.scan_resources_task',
         'schedule': crontab(hour=2, minute=0),  # Run at 2:00 AM every day
         'args': (None,),  # Scan all providers
+        'options': {'queue': 'scan'},
     },
     'evaluate-compliance-daily': {
         'task': 'worker.tasks.evaluator.evaluate_compliance_task',
         'schedule': crontab(hour=3, minute=0),  # Run at 3:00 AM every day
+        'options': {'queue': 'eval'},
     },
     'scan-aws-resources-hourly': {
-        'task': 'worker.tasks.scanner.scan_resources_task',
+        'task': 'worker.tasks.scanner.scan_aws_task',
         'schedule': crontab(minute=0),  # Run every hour
-        'args': ('aws',),  # Scan only AWS resources
+        'options': {'queue': 'scan'},
     },
     'scan-azure-resources-hourly': {
-        'task': 'worker.tasks.scanner.scan_resources_task',
+        'task': 'worker.tasks.scanner.scan_azure_task',
         'schedule': crontab(minute=15),  # Run every hour at 15 minutes past
-        'args': ('azure',),  # Scan only Azure resources
+        'options': {'queue': 'scan'},
     },
     'scan-gcp-resources-hourly': {
-        'task': 'worker.tasks.scanner.scan_resources_task',
+        'task': 'worker.tasks.scanner.scan_gcp_task',
         'schedule': crontab(minute=30),  # Run every hour at 30 minutes past
-        'args': ('gcp',),  # Scan only GCP resources
+        'options': {'queue': 'scan'},
+    },
+    'ingest-cloud-data': {
+        'task': 'worker.tasks.ingest.ingest_cloud_data_task',
+        'schedule': timedelta(seconds=30),  # Run every 30 seconds
+        'options': {'queue': 'scan'},
     },
 }
 
 # Register tasks
-@app.task(name='worker.tasks.scanner.scan_resources_task')
+# Polled through the API's /jobs endpoint
+@app.task(name='worker.tasks.scanner.scan_resources_task', ignore_result=False)
 def scan_resources_task_wrapper(cloud_provider=None):
     return scan_resources_task(cloud_provider)
 
-@app.task(name='worker.tasks.evaluator.evaluate_compliance_task')
+# One task per provider, so beat can call them directly and each can be routed or
+# rate-limited on its own
+@app.task(name='worker.tasks.scanner.scan_aws_task')
+def scan_aws_task_wrapper():
+    return scan_aws_task()
+
+@app.task(name='worker.tasks.scanner.scan_azure_task')
+def scan_azure_task_wrapper():
+    return scan_azure_task()
+
+@app.task(name='worker.tasks.scanner.scan_gcp_task')
+def scan_gcp_task_wrapper():
+    return scan_gcp_task()
+
+# Each slice is acknowledged only once it finishes, so a worker restart redelivers the
+# slice in flight rather than the whole scan
+@app.task(
+    name='worker.tasks.scanner.scan_slice_task',
+    acks_late=True,
+    autoretry_for=RETRYABLE_SCAN_ERRORS,
+    retry_backoff=True,
+    max_retries=3,
+    # The chord needs every slice's result to run the aggregate
+    ignore_result=False
+)
+def scan_slice_task_wrapper(cloud_provider, region, resource_type):
+    return scan_slice_task(cloud_provider, region, resource_type)
+
+# Holds the scan totals the API reports for the scan_id
+@app.task(name='worker.tasks.scanner.aggregate_scan_task', ignore_result=False)
+def aggregate_scan_task_wrapper(results, started_at=None, lock_keys=None, lock_token=None):
+    return aggregate_scan_task(results, started_at, lock_keys, lock_token)
+
+# Errback of the aggregate; Celery passes the aggregate's task ID, and calls it that way
+# only while the lock arguments are keyword-only
+@app.task(name='worker.tasks.scanner.scan_failed_task')
+def scan_failed_task_wrapper(task_id, *, lock_keys=None, lock_token=None):
+    return scan_failed_task(task_id, lock_keys, lock_token)
+
+# Polled through the API's /jobs endpoint
+@app.task(name='worker.tasks.evaluator.evaluate_compliance_task', ignore_result=False)
 def evaluate_compliance_task_wrapper():
     return evaluate_compliance_task()
 
-@app.task(name='worker.tasks.remediation.apply_remediation_task')
-def apply_remediation_task_wrapper(workflow_id, approved_tags, approved_by=None):
-    return apply_remediation_task(workflow_id, approved_tags, approved_by)
+# Tagging a single workflow's resource should take seconds, so give up much sooner
+@app.task(
+    name='worker.tasks.remediation.apply_remediation_task',
+    soft_time_limit=120,
+    time_limit=180,
+    # Polled through the API's /jobs endpoint
+    ignore_result=False
+)
+def apply_remediation_task_wrapper(workflow_id, tags_sha, approved_by=None):
+    return apply_remediation_task(workflow_id, tags_sha, approved_by)
+
+# A batch tags many resources through the bulk APIs, so it gets longer than one workflow
+@app.task(
+    name='worker.tasks.remediation.apply_remediation_batch_task',
+    soft_time_limit=600,
+    time_limit=660,
+    ignore_result=False
+)
+def apply_remediation_batch_task_wrapper(approvals, approved_by=None):
+    return apply_remediation_batch_task(approvals, approved_by)
+
+@app.task(name='worker.tasks.ingest.ingest_cloud_data_task')
+def ingest_cloud_data_task_wrapper():
+    return ingest_cloud_data_task()
 
 if __name__ == '__main__':
     # If this file is run directly, start the Celery worker
@@ -0,0 +1,36 @@
+# worker/tasks/_engine.py
+"""
+Per-process ComplianceEngine shared by the worker tasks
+"""
+import logging
+from typing import Optional
+
+from celery.signals import worker_process_init
+
+from core.compliance.engine import ComplianceEngine
+
+logger = logging.getLogger(__name__)
+
+_ENGINE: Optional[ComplianceEngine] = None
+
+def get_engine() -> ComplianceEngine:
+    """
+    Get this process's ComplianceEngine, creating it on first use
+    
+    Returns:
+        Shared ComplianceEngine
+    """
+    global _ENGINE
+    if _ENGINE is None:
+        _ENGINE = ComplianceEngine()
+    return _ENGINE
+
+@worker_process_init.connect
+def _init_engine(**kwargs) -> None:
+    """
+    Build the engine and its SDK clients when a prefork child starts
+    
+    Moves client setup off the first task's latency and onto worker startup.
+    """
+    get_engine().warm_up()
+    logger.info("Compliance engine initialized for worker process")
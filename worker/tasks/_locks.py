@@ -0,0 +1,135 @@
+# worker/tasks/_locks.py
+"""
+Redis locks that keep at most one run of a task going at a time
+"""
+import functools
+import logging
+import os
+import socket
+import uuid
+from typing import Callable, List, Optional
+
+from redis import RedisError
+
+from worker.tasks._pools import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Deletes the key only if it still holds our token, so an expired lock that another
+# run has since taken is left alone
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+def acquire_lock(key: str, timeout: int) -> Optional[str]:
+    """
+    Take a lock unless another run holds it
+    
+    Args:
+        key: Redis key of the lock
+        timeout: Seconds after which the lock expires if it is never released
+    
+    Returns:
+        Token identifying this holder, or None if the lock is already held
+    
+    Raises:
+        redis.RedisError: If Redis cannot be reached
+    """
+    token = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex}"
+    if get_redis().set(key, token, nx=True, ex=timeout):
+        return token
+    return None
+
+def release_lock(key: str, token: str) -> bool:
+    """
+    Release a lock if it is still held with the given token
+    
+    Args:
+        key: Redis key of the lock
+        token: Token returned by acquire_lock
+    
+    Returns:
+        True if the lock was released, False if it had expired or changed hands
+    """
+    try:
+        client = get_redis()
+        return bool(client.eval(_RELEASE_SCRIPT, 1, key, token))
+    except RedisError as e:
+        logger.warning(f"Could not release lock {key}: {str(e)}")
+        return False
+
+def acquire_locks(keys: List[str], timeout: int) -> Optional[str]:
+    """
+    Take several locks together, or none of them if any is already held
+    
+    Args:
+        keys: Redis keys of the locks
+        timeout: Seconds after which the locks expire if they are never released
+    
+    Returns:
+        Token holding every lock, or None if one of them is already held
+    
+    Raises:
+        redis.RedisError: If Redis cannot be reached
+    """
+    token = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex}"
+    client = get_redis()
+    taken = []
+    try:
+        for key in keys:
+            if not client.set(key, token, nx=True, ex=timeout):
+                return None
+            taken.append(key)
+        taken = []
+        return token
+    finally:
+        # Hand back the locks taken before one turned out to be held
+        release_locks(taken, token)
+
+def release_locks(keys: List[str], token: str) -> None:
+    """
+    Release every lock in keys still held with the given token
+    
+    Args:
+        keys: Redis keys of the locks
+        token: Token returned by acquire_locks
+    """
+    for key in keys:
+        release_lock(key, token)
+
+def singleton(lock_key: Callable[..., str], timeout: int = 3600):
+    """
+    Skip a task while another run with the same lock key is in progress
+    
+    If Redis is unavailable the task runs without the lock rather than not at all.
+    
+    Args:
+        lock_key: Function called with the task's arguments that returns the lock's key
+        timeout: Seconds after which the lock expires if the task never releases it
+    
+    Returns:
+        Decorator for a task function; skipped runs return {"status": "skipped"}
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = lock_key(*args, **kwargs)
+            try:
+                token = acquire_lock(key, timeout)
+            except RedisError as e:
+                logger.warning(f"Could not take lock {key}, running without it: {str(e)}")
+                return func(*args, **kwargs)
+            
+            if token is None:
+                logger.info(f"{func.__name__} already running under {key}, skipping")
+                return {"status": "skipped", "message": f"Already running under {key}"}
+            
+            try:
+                return func(*args, **kwargs)
+            finally:
+                release_lock(key, token)
+        return wrapper
+    return decorator
@@ -0,0 +1,44 @@
+# worker/tasks/_pools.py
+"""
+Per-process Redis connection pool shared by the worker tasks
+
+Database access goes through SQLAlchemy's pooled engine in models.db.
+"""
+import logging
+import os
+from typing import Optional
+
+import redis
+from celery.signals import worker_process_init, worker_process_shutdown
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# Most Redis connections a process may open at once
+REDIS_MAX_CONNECTIONS = int(os.getenv("WORKER_REDIS_MAX_CONNECTIONS", "32"))
+
+_redis_pool: Optional[redis.ConnectionPool] = None
+
+def get_redis() -> redis.Redis:
+    """Get a Redis client backed by this process's connection pool"""
+    global _redis_pool
+    if _redis_pool is None:
+        _redis_pool = redis.ConnectionPool.from_url(
+            REDIS_URL,
+            max_connections=REDIS_MAX_CONNECTIONS,
+            decode_responses=True
+        )
+    return redis.Redis(connection_pool=_redis_pool)
+
+@worker_process_init.connect
+def _init_pools(**kwargs) -> None:
+    """Open the pool when a worker process starts; pools must not cross a fork"""
+    get_redis()
+    logger.info("Redis connection pool initialized for worker process")
+
+@worker_process_shutdown.connect
+def _close_pools(**kwargs) -> None:
+    """Close pooled connections when a worker process exits"""
+    if _redis_pool is not None:
+        _redis_pool.disconnect()
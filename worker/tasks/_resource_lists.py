@@ -0,0 +1,20 @@
+# worker/tasks/_resource_lists.py
+"""
+Invalidation of the API's cached resource lists after the worker writes resources
+"""
+import logging
+
+from redis import RedisError
+
+from worker.tasks._pools import get_redis
+from core.cache import RESOURCE_LIST_GENERATION_KEY
+
+logger = logging.getLogger(__name__)
+
+def invalidate_resource_lists() -> None:
+    """Bump the resource list generation so every API process stops serving its cached lists"""
+    try:
+        get_redis().incr(RESOURCE_LIST_GENERATION_KEY)
+    except RedisError as e:
+        # The API's cache TTL still bounds how long the old lists are served
+        logger.warning(f"Could not invalidate cached resource lists: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,151 @@
+# worker/tasks/_verdicts.py
+"""
+Redis-backed record of the resource state each compliance verdict was computed from
+"""
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, List
+
+from worker.tasks._pools import get_redis
+from core.compliance.engine import ComplianceEngine
+from core.compliance.policy import CompiledPolicy
+from models.db import SessionLocal
+from models.resource import ResourceModel, ComplianceStatus
+
+logger = logging.getLogger(__name__)
+
+# Hash of resource ID -> fingerprint of the state its stored verdict was computed from
+VERDICT_HASH = "compliance:verdict"
+
+# Resource IDs per HMGET/HSET/HDEL call and per evaluate_resources query
+VERDICT_BATCH_SIZE = 1000
+
+# Share of resources that must have changed before one pass over the whole table is
+# cheaper than looking the changed ones up by ID
+FULL_EVALUATION_RATIO = float(os.getenv("VERDICT_FULL_EVALUATION_RATIO", "0.5"))
+
+def policy_version(policies: List[CompiledPolicy]) -> str:
+    """
+    Hash the content of the policies a verdict is evaluated against
+    
+    Args:
+        policies: Compiled active policies
+    
+    Returns:
+        Hex digest that changes whenever a policy is added, removed or edited
+    """
+    payload = [
+        [
+            policy.id,
+            policy.name,
+            [[tag.name, tag.allowed_values, tag.suggested_value] for tag in policy.required_tags],
+            sorted(policy.resource_types),
+            sorted(policy.cloud_providers)
+        ]
+        for policy in policies
+    ]
+    return hashlib.sha256(json.dumps(payload, default=str).encode()).hexdigest()
+
+def fingerprint(cloud_provider: str, resource_type: str, resource_id: str,
+                tags: Dict[str, str], version: str) -> str:
+    """Hash the parts of a resource's state that its compliance verdict depends on"""
+    payload = json.dumps(
+        [cloud_provider, resource_type, resource_id, sorted((tags or {}).items()), version],
+        default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def evaluate_changed_resources(engine: ComplianceEngine) -> Dict[str, Any]:
+    """
+    Evaluate only the resources whose tags or applicable policies changed since their last evaluation
+    
+    Stored statuses of unchanged resources are counted as they are. When most
+    resources changed, all of them are evaluated in one pass instead. Verdicts of
+    resources no longer in the database are dropped.
+    
+    Args:
+        engine: Compliance engine used for the evaluation
+    
+    Returns:
+        Dict with compliance statistics for all resources, plus how many were evaluated
+    
+    Raises:
+        redis.RedisError: If the verdict cache cannot be read or written
+    """
+    version = policy_version(engine.policy_manager.get_active_policies())
+    
+    fingerprints = {}
+    statuses = {}
+    with SessionLocal() as db:
+        rows = db.query(
+            ResourceModel.resource_id,
+            ResourceModel.cloud_provider,
+            ResourceModel.resource_type,
+            ResourceModel.tags,
+            ResourceModel.compliance_status
+        ).yield_per(VERDICT_BATCH_SIZE)
+        
+        for resource_id, cloud_provider, resource_type, tags, compliance_status in rows:
+            fingerprints[resource_id] = fingerprint(cloud_provider, resource_type, resource_id, tags, version)
+            statuses[resource_id] = compliance_status
+    
+    client = get_redis()
+    resource_ids = list(fingerprints)
+    changed = []
+    for start in range(0, len(resource_ids), VERDICT_BATCH_SIZE):
+        chunk = resource_ids[start:start + VERDICT_BATCH_SIZE]
+        for resource_id, cached in zip(chunk, client.hmget(VERDICT_HASH, chunk)):
+            if cached != fingerprints[resource_id]:
+                changed.append(resource_id)
+    
+    # Verdicts of resources deleted since they were evaluated
+    stale = [
+        resource_id
+        for resource_id, _ in client.hscan_iter(VERDICT_HASH, count=VERDICT_BATCH_SIZE)
+        if resource_id not in fingerprints
+    ]
+    
+    total = len(resource_ids)
+    if len(changed) > total * FULL_EVALUATION_RATIO:
+        changed = resource_ids
+        results = engine.evaluate_all_resources()
+        compliant = results["compliant"]
+        non_compliant = results["non_compliant"]
+    else:
+        compliant = 0
+        non_compliant = 0
+        for start in range(0, len(changed), VERDICT_BATCH_SIZE):
+            results = engine.evaluate_resources(changed[start:start + VERDICT_BATCH_SIZE])
+            compliant += results["compliant"]
+            non_compliant += results["non_compliant"]
+        
+        # Unchanged resources keep the status stored by their last evaluation
+        changed_set = set(changed)
+        for resource_id, compliance_status in statuses.items():
+            if resource_id in changed_set:
+                continue
+            if compliance_status == ComplianceStatus.COMPLIANT:
+                compliant += 1
+            elif compliance_status == ComplianceStatus.NON_COMPLIANT:
+                non_compliant += 1
+    
+    if changed or stale:
+        with client.pipeline(transaction=False) as pipe:
+            for start in range(0, len(changed), VERDICT_BATCH_SIZE):
+                chunk = changed[start:start + VERDICT_BATCH_SIZE]
+                pipe.hset(VERDICT_HASH, mapping={resource_id: fingerprints[resource_id] for resource_id in chunk})
+            for start in range(0, len(stale), VERDICT_BATCH_SIZE):
+                pipe.hdel(VERDICT_HASH, *stale[start:start + VERDICT_BATCH_SIZE])
+            pipe.execute()
+    
+    logger.info(f"Evaluated {len(changed)} resources; {total - len(changed)} unchanged")
+    
+    return {
+        "total": total,
+        "compliant": compliant,
+        "non_compliant": non_compliant,
+        "compliance_rate": (compliant / total) * 100 if total else 0,
+        "evaluated": len(changed)
+    }
@@ -3,18 +3,33 @@
 Background task for evaluating compliance
 """
 import logging
+import os
 from datetime import datetime
 import time
 
-from backend.core.compliance.engine import ComplianceEngine
-from backend.models.db import get_db
+from celery.exceptions import SoftTimeLimitExceeded
+from redis import RedisError
+
+from worker.tasks._engine import get_engine
+from worker.tasks._locks import singleton
+from worker.tasks._resource_lists import invalidate_resource_lists
+from worker.tasks._verdicts import evaluate_changed_resources
+from models.db import get_db
 
 logger = logging.getLogger(__name__)
 
+# Seconds the evaluation lock is held at most if a run dies without releasing it
+EVALUATION_LOCK_TIMEOUT = int(os.getenv("EVALUATION_LOCK_TIMEOUT", "3600"))
+
+@singleton(lambda: "lock:evaluate", timeout=EVALUATION_LOCK_TIMEOUT)
 def evaluate_compliance_task() -> dict:
     """
     Task to evaluate compliance for all resources
     
+    Resources whose tags and applicable policies are unchanged since their last
+    evaluation are skipped; if the verdict cache is unavailable every resource
+    is evaluated. An evaluation requested while another is running is skipped.
+    
     Returns:
         Dict with evaluation results
     """
@@ -22,8 +37,14 @@ def evaluate_compliance_task() -> dict:
     start_time = time.time()
     
     try:
-        compliance_engine = ComplianceEngine()
-        results = compliance_engine.evaluate_all_resources()
+        compliance_engine = get_engine()
+        try:
+            results = evaluate_changed_resources(compliance_engine)
+        except RedisError as e:
+            logger.warning(f"Verdict cache unavailable, evaluating all resources: {str(e)}")
+            results = compliance_engine.evaluate_all_resources()
+        # Compliance statuses are part of the API's cached resource lists
+        invalidate_resource_lists()
         
         duration = time.time() - start_time
         logger.info(f"Completed compliance evaluation in {duration:.2f}s. "
@@ -34,6 +55,13 @@ def evaluate_compliance_task() -> dict:
             "results": results,
             "duration_seconds": duration
         }
+    except SoftTimeLimitExceeded:
+        logger.warning("Compliance evaluation exceeded its time limit")
+        return {
+            "status": "timeout",
+            "message": "Compliance evaluation exceeded its time limit",
+            "duration_seconds": time.time() - start_time
+        }
     except Exception as e:
         logger.error(f"Error in compliance evaluation: {str(e)}", exc_info=True)
         return {
@@ -0,0 +1,26 @@
+# worker/tasks/ingest.py
+"""
+Background task for ingesting cloud usage data
+"""
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+def ingest_cloud_data_task() -> dict:
+    """
+    Task to ingest cloud usage data
+    
+    Returns:
+        Dict with ingestion results
+    """
+    logger.info("Ingesting data...")
+    start_time = time.time()
+    
+    # Placeholder for ingestion logic
+    # e.g., connect to AWS / private cloud APIs, fetch usage data, store in Postgres
+    
+    return {
+        "status": "success",
+        "duration_seconds": time.time() - start_time
+    }
@@ -1,26 +1,36 @@
 # worker/tasks/remediation.py
 """
-Background task for applying remediation
+Background tasks for applying remediation
+
+The API claims a workflow (PENDING -> APPROVED) before queueing it; a workflow
+whose tags are not applied here is handed back to PENDING so it can be approved again.
 """
+import json
 import logging
-from datetime import datetime
 import time
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional
+
+from celery.exceptions import SoftTimeLimitExceeded
 
-from backend.core.compliance.engine import ComplianceEngine
-from backend.models.db import get_db
-from backend.models.workflow import WorkflowModel, WorkflowStatus
+from worker.tasks._engine import get_engine
+from worker.tasks._pools import get_redis
+from worker.tasks._resource_lists import invalidate_resource_lists
+from models.db import SessionLocal
+from models.workflow import WorkflowModel, WorkflowStatus
 
 logger = logging.getLogger(__name__)
 
-def apply_remediation_task(workflow_id: int, approved_tags: Dict[str, str], 
+# Same key prefix as backend/core/queue.py, which stores the approved tags
+REMEDIATION_TAGS_PREFIX = "rem:tags:"
+
+def apply_remediation_task(workflow_id: int, tags_sha: str, 
                          approved_by: Optional[str] = None) -> dict:
     """
     Task to apply approved remediation tags
     
     Args:
         workflow_id: ID of the remediation workflow
-        approved_tags: Dict of tag names and values to apply
+        tags_sha: SHA-256 of the approved tags, stored in Redis by the API
         approved_by: User who approved the remediation
         
     Returns:
@@ -29,13 +39,24 @@ def apply_remediation_task(workflow_id: int, approved_tags: Dict[str, str],
     logger.info(f"Starting remediation for workflow {workflow_id}")
     start_time = time.time()
     
+    success = False
     try:
-        compliance_engine = ComplianceEngine()
-        success = compliance_engine.approve_remediation(workflow_id, approved_tags)
+        approved_tags = _load_tags([tags_sha]).get(tags_sha)
+        if approved_tags is None:
+            logger.error(f"Approved tags {tags_sha} for workflow {workflow_id} expired or missing")
+            return {
+                "status": "error",
+                "message": f"Approved tags for workflow {workflow_id} expired or missing",
+                "duration_seconds": time.time() - start_time
+            }
+        
+        compliance_engine = get_engine()
+        success = compliance_engine.approve_remediation(workflow_id, approved_tags, approved_by)
         
         duration = time.time() - start_time
         
         if success:
+            invalidate_resource_lists()
             logger.info(f"Completed remediation for workflow {workflow_id} in {duration:.2f}s")
             return {
                 "status": "success",
@@ -49,10 +70,98 @@ def apply_remediation_task(workflow_id: int, approved_tags: Dict[str, str],
                 "message": f"Failed to apply remediation for workflow {workflow_id}",
                 "duration_seconds": duration
             }
+    except SoftTimeLimitExceeded:
+        logger.warning(f"Remediation for workflow {workflow_id} exceeded its time limit")
+        return {
+            "status": "timeout",
+            "message": f"Remediation for workflow {workflow_id} exceeded its time limit",
+            "duration_seconds": time.time() - start_time
+        }
     except Exception as e:
         logger.error(f"Error in remediation task: {str(e)}", exc_info=True)
         return {
             "status": "error",
             "message": f"Error in remediation task: {str(e)}",
             "duration_seconds": time.time() - start_time
-        }
\ No newline at end of file
+        }
+    finally:
+        if not success:
+            _release_workflows([workflow_id])
+
+def apply_remediation_batch_task(approvals: List[List], approved_by: Optional[str] = None) -> dict:
+    """
+    Task to apply approved remediation tags for several workflows at once
+    
+    Args:
+        approvals: [workflow ID, SHA-256 of its approved tags] pairs; the tags are
+            stored in Redis by the API
+        approved_by: User who approved the remediations
+        
+    Returns:
+        Dict with the applied and failed workflow IDs
+    """
+    logger.info(f"Starting batch remediation of {len(approvals)} workflows")
+    start_time = time.time()
+    
+    results: Dict[int, bool] = {}
+    try:
+        tag_sets = _load_tags({tags_sha for _, tags_sha in approvals})
+        missing = [workflow_id for workflow_id, tags_sha in approvals if tags_sha not in tag_sets]
+        if missing:
+            logger.error(f"Approved tags for workflows {missing} expired or missing")
+        
+        compliance_engine = get_engine()
+        results = compliance_engine.approve_remediation_batch(
+            {
+                workflow_id: tag_sets[tags_sha]
+                for workflow_id, tags_sha in approvals
+                if tags_sha in tag_sets
+            },
+            approved_by
+        )
+    except SoftTimeLimitExceeded:
+        logger.warning(f"Batch remediation of {len(approvals)} workflows exceeded its time limit")
+    except Exception as e:
+        logger.error(f"Error in batch remediation task: {str(e)}", exc_info=True)
+    finally:
+        failed = [workflow_id for workflow_id, _ in approvals if not results.get(workflow_id)]
+        if failed:
+            _release_workflows(failed)
+        if len(failed) < len(approvals):
+            invalidate_resource_lists()
+    
+    duration = time.time() - start_time
+    logger.info(f"Completed batch remediation in {duration:.2f}s. "
+               f"Applied: {len(approvals) - len(failed)}, Failed: {len(failed)}")
+    
+    return {
+        "status": "success" if not failed else "partial",
+        "applied": [workflow_id for workflow_id, _ in approvals if results.get(workflow_id)],
+        "failed": failed,
+        "duration_seconds": duration
+    }
+
+def _load_tags(tag_shas: Iterable[str]) -> Dict[str, Dict[str, str]]:
+    """Read stored tag sets by hash; expired ones are left out of the result"""
+    tag_shas = list(tag_shas)
+    payloads = get_redis().mget([f"{REMEDIATION_TAGS_PREFIX}{tags_sha}" for tags_sha in tag_shas])
+    return {
+        tags_sha: json.loads(payload)
+        for tags_sha, payload in zip(tag_shas, payloads)
+        if payload is not None
+    }
+
+def _release_workflows(workflow_ids: List[int]) -> None:
+    """Return claimed remediation workflows to PENDING after a failed remediation"""
+    try:
+        with SessionLocal() as db:
+            db.query(WorkflowModel).filter(
+                WorkflowModel.id.in_(workflow_ids),
+                WorkflowModel.status == WorkflowStatus.APPROVED
+            ).update(
+                {"status": WorkflowStatus.PENDING, "approved_by": None, "completed_at": None},
+                synchronize_session=False
+            )
+            db.commit()
+    except Exception as e:
+        logger.error(f"Could not return workflows {workflow_ids} to pending: {str(e)}", exc_info=True)
\ No newline at end of file
@@ -1,196 +1,328 @@
 # worker/tasks/scanner.py
 """
-Background task for scanning cloud resources
+Background tasks for scanning cloud resources
+
+A scan is split into one slice per (provider, region, resource type). The slices
+run as separate tasks across every worker on the scan queue, and a chord collects
+their counts once all of them have finished. With SCAN_MODE=inline the whole scan
+instead runs inside the task on one event loop, for deployments with a single worker.
 """
+import asyncio
 import logging
+import os
 from datetime import datetime
-from typing import Optional, List
+from typing import Callable, Dict, Optional, List, Tuple
 import time
 
-from backend.core.compliance.engine import ComplianceEngine
-from backend.models.db import get_db
+from azure.core.exceptions import AzureError
+from botocore.exceptions import BotoCoreError
+from celery import chord, signature
+from celery.exceptions import SoftTimeLimitExceeded
+from google.api_core.exceptions import GoogleAPIError
+from redis import RedisError
+
+from worker.tasks._engine import get_engine
+from worker.tasks._locks import acquire_locks, release_locks
+from worker.tasks._resource_lists import invalidate_resource_lists
+from models.db import async_engine, get_db
 
 logger = logging.getLogger(__name__)
 
+SCAN_SLICE_TASK = 'worker.tasks.scanner.scan_slice_task'
+AGGREGATE_SCAN_TASK = 'worker.tasks.scanner.aggregate_scan_task'
+SCAN_FAILED_TASK = 'worker.tasks.scanner.scan_failed_task'
+
+# Provider errors worth retrying a slice for; connection failures and throttling
+# surface as these, while bad input fails the same way on every attempt
+RETRYABLE_SCAN_ERRORS = (BotoCoreError, AzureError, GoogleAPIError)
+
+# Seconds a provider's scan lock is held at most; it is normally released by the
+# aggregate task, or by scan_failed_task if a slice fails, and expires on its own
+# only if neither runs
+SCAN_LOCK_TIMEOUT = int(os.getenv("SCAN_LOCK_TIMEOUT", "3600"))
+
+# "chord" fans a scan out as slice tasks; "inline" gathers every fetch in this task
+SCAN_MODE = os.getenv("SCAN_MODE", "chord")
+
 def scan_resources_task(cloud_provider: Optional[str] = None) -> dict:
     """
-    Task to scan cloud resources and update the database
+    Task to dispatch a resource scan as a chord of slice tasks
+    
+    Only one scan per provider runs at a time; a scan of all providers holds every
+    provider's lock, and a scan requested while an overlapping one is still in
+    progress is skipped.
     
     Args:
         cloud_provider: Optional cloud provider to scan (aws, azure, gcp)
-        
+    
     Returns:
-        Dict with scan results
+        Dict with the number of slices and the ID of the aggregate task, which
+        holds the scan results once every slice has finished; in inline mode, the
+        scan results themselves
     """
-    logger.info(f"Starting resource scan for {cloud_provider or 'all providers'}")
-    start_time = time.time()
+    logger.info(f"Dispatching resource scan for {cloud_provider or 'all providers'}")
     
+    providers = [cloud_provider.lower()] if cloud_provider else ["aws", "azure", "gcp"]
+    lock_keys = [f"lock:scan:{provider}" for provider in providers]
     try:
-        compliance_engine = ComplianceEngine()
-        resources = compliance_engine.scan_resources(cloud_provider)
+        lock_token = acquire_locks(lock_keys, SCAN_LOCK_TIMEOUT)
+    except RedisError as e:
+        logger.warning(f"Could not take locks {lock_keys}, scanning without them: {str(e)}")
+        lock_keys, lock_token = [], None
+    else:
+        if lock_token is None:
+            logger.info(f"Resource scan for {cloud_provider or 'all providers'} already running, skipping")
+            return {
+                "status": "skipped",
+                "message": f"Resource scan for {cloud_provider or 'all providers'} already running"
+            }
+    
+    dispatched = False
+    try:
+        if SCAN_MODE == "inline":
+            return _scan_inline(cloud_provider)
+        
+        slices = _slice_lister(cloud_provider)()
         
-        duration = time.time() - start_time
-        logger.info(f"Completed resource scan in {duration:.2f}s. Found {len(resources)} resources.")
+        header = [
+            signature(SCAN_SLICE_TASK, args=(provider, region, resource_type))
+            for provider, region, resource_type in slices
+        ]
+        # The aggregate releases the locks once every slice has finished; if a slice
+        # fails for good the aggregate never runs, so its errback releases them instead
+        body = signature(
+            AGGREGATE_SCAN_TASK,
+            kwargs={"started_at": time.time(), "lock_keys": lock_keys, "lock_token": lock_token}
+        )
+        body.link_error(signature(
+            SCAN_FAILED_TASK,
+            kwargs={"lock_keys": lock_keys, "lock_token": lock_token}
+        ))
+        result = chord(header)(body)
+        dispatched = True
+        
+        logger.info(f"Dispatched {len(slices)} scan slices, aggregate task {result.id}")
         
         return {
             "status": "success",
-            "message": f"Scanned {len(resources)} resources",
-            "resource_count": len(resources),
-            "duration_seconds": duration
+            "message": f"Dispatched {len(slices)} scan slices",
+            "slice_count": len(slices),
+            "scan_id": result.id
+        }
+    except SoftTimeLimitExceeded:
+        logger.warning("Dispatching resource scan exceeded its time limit")
+        return {
+            "status": "timeout",
+            "message": "Dispatching resource scan exceeded its time limit"
         }
     except Exception as e:
-        logger.error(f"Error in resource scan: {str(e)}", exc_info=True)
+        logger.error(f"Error dispatching resource scan: {str(e)}", exc_info=True)
         return {
             "status": "error",
-            "message": f"Error in resource scan: {str(e)}",
-            "duration_seconds": time.time() - start_time
+            "message": f"Error dispatching resource scan: {str(e)}"
         }
+    finally:
+        if lock_token and not dispatched:
+            release_locks(lock_keys, lock_token)
 
-# worker/tasks/evaluator.py
-"""
-Background task for evaluating compliance
-"""
-import logging
-from datetime import datetime
-import time
+ScanSlice = Tuple[str, Optional[str], str]
 
-from backend.core.compliance.engine import ComplianceEngine
-from backend.models.db import get_db
+def _provider_slices(provider: str, connector_attr: str) -> Callable[[], List[ScanSlice]]:
+    """Build a function listing one provider's scan slices straight from its connector"""
+    def list_slices() -> List[ScanSlice]:
+        connector = getattr(get_engine(), connector_attr)
+        return [(provider, region, resource_type) for region, resource_type in connector.list_slices()]
+    return list_slices
 
-logger = logging.getLogger(__name__)
+_aws_slices = _provider_slices("aws", "aws_connector")
+_azure_slices = _provider_slices("azure", "azure_connector")
+_gcp_slices = _provider_slices("gcp", "gcp_connector")
 
-def evaluate_compliance_task() -> dict:
+def _all_slices() -> List[ScanSlice]:
+    """List the scan slices of every provider"""
+    return _aws_slices() + _azure_slices() + _gcp_slices()
+
+# Slice listers resolved once at import, keyed by the cloud_provider a scan is started with
+_SCANNERS: Dict[Optional[str], Callable[[], List[ScanSlice]]] = {
+    "aws": _aws_slices,
+    "azure": _azure_slices,
+    "gcp": _gcp_slices,
+    None: _all_slices,
+}
+
+def _slice_lister(cloud_provider: Optional[str]) -> Callable[[], List[ScanSlice]]:
+    """Look up the slice lister for a provider name, or for all providers if None"""
+    try:
+        return _SCANNERS[cloud_provider.lower() if cloud_provider else None]
+    except KeyError:
+        raise ValueError(f"Unsupported cloud provider: {cloud_provider}")
+
+def scan_aws_task() -> dict:
+    """Task to scan AWS resources"""
+    return scan_resources_task("aws")
+
+def scan_azure_task() -> dict:
+    """Task to scan Azure resources"""
+    return scan_resources_task("azure")
+
+def scan_gcp_task() -> dict:
+    """Task to scan GCP resources"""
+    return scan_resources_task("gcp")
+
+def _scan_inline(cloud_provider: Optional[str]) -> dict:
     """
-    Task to evaluate compliance for all resources
+    Scan every region and resource type concurrently on one event loop in this task
+    
+    Fetches run through the connectors' list_resources_async, so the scan takes about
+    as long as its slowest fetch rather than the sum of all of them. They run in the
+    event loop's default executor via asyncio.to_thread.
+    
+    Args:
+        cloud_provider: Optional cloud provider to scan (aws, azure, gcp)
     
     Returns:
-        Dict with evaluation results
+        Dict with scan results
     """
-    logger.info("Starting compliance evaluation")
     start_time = time.time()
     
-    try:
-        compliance_engine = ComplianceEngine()
-        results = compliance_engine.evaluate_all_resources()
-        
-        duration = time.time() - start_time
-        logger.info(f"Completed compliance evaluation in {duration:.2f}s. "
-                   f"Compliant: {results['compliant']}, Non-compliant: {results['non_compliant']}")
-        
-        return {
-            "status": "success",
-            "results": results,
-            "duration_seconds": duration
-        }
-    except Exception as e:
-        logger.error(f"Error in compliance evaluation: {str(e)}", exc_info=True)
-        return {
-            "status": "error",
-            "message": f"Error in compliance evaluation: {str(e)}",
-            "duration_seconds": time.time() - start_time
-        }
-
-# worker/tasks/remediation.py
-"""
-Background task for applying remediation
-"""
-import logging
-from datetime import datetime
-import time
-from typing import Dict, Optional
-
-from backend.core.compliance.engine import ComplianceEngine
-from backend.models.db import get_db
-from backend.models.workflow import WorkflowModel, WorkflowStatus
-
-logger = logging.getLogger(__name__)
+    async def scan():
+        try:
+            return await get_engine().scan_resources_async(cloud_provider)
+        finally:
+            # Pooled asyncpg connections are bound to this run's event loop, which
+            # asyncio.run closes; the next inline scan must open fresh ones
+            await async_engine.dispose()
+    
+    resources = asyncio.run(scan())
+    invalidate_resource_lists()
+    
+    duration = time.time() - start_time
+    logger.info(f"Completed inline resource scan in {duration:.2f}s. Found {len(resources)} resources.")
+    
+    return {
+        "status": "success",
+        "message": f"Scanned {len(resources)} resources",
+        "resource_count": len(resources),
+        "duration_seconds": duration
+    }
 
-def apply_remediation_task(workflow_id: int, approved_tags: Dict[str, str], 
-                         approved_by: Optional[str] = None) -> dict:
+def scan_slice_task(cloud_provider: str, region: Optional[str], resource_type: str) -> dict:
     """
-    Task to apply approved remediation tags
+    Task to scan one resource type of one provider and region
+    
+    Provider errors are raised rather than returned so the task can be retried. A
+    slice that runs out of time is reported with no resources so the rest of the
+    scan still completes.
     
     Args:
-        workflow_id: ID of the remediation workflow
-        approved_tags: Dict of tag names and values to apply
-        approved_by: User who approved the remediation
-        
+        cloud_provider: Cloud provider to scan (aws, azure, gcp)
+        region: Region to scan, or None for providers scanned without regions
+        resource_type: Resource type to scan
+    
     Returns:
-        Dict with remediation results
+        Dict with the slice and the number of resources found
     """
-    logger.info(f"Starting remediation for workflow {workflow_id}")
     start_time = time.time()
-    
     try:
-        compliance_engine = ComplianceEngine()
-        success = compliance_engine.approve_remediation(workflow_id, approved_tags)
-        
-        duration = time.time() - start_time
-        
-        if success:
-            logger.info(f"Completed remediation for workflow {workflow_id} in {duration:.2f}s")
-            return {
-                "status": "success",
-                "message": f"Remediation completed for workflow {workflow_id}",
-                "duration_seconds": duration
-            }
-        else:
-            logger.error(f"Failed to apply remediation for workflow {workflow_id}")
-            return {
-                "status": "error",
-                "message": f"Failed to apply remediation for workflow {workflow_id}",
-                "duration_seconds": duration
-            }
-    except Exception as e:
-        logger.error(f"Error in remediation task: {str(e)}", exc_info=True)
+        resource_count = get_engine().scan_slice(cloud_provider, resource_type, region)
+    except SoftTimeLimitExceeded:
+        logger.warning(
+            f"Scan of {cloud_provider} {resource_type} resources"
+            f"{f' in {region}' if region else ''} exceeded its time limit"
+        )
         return {
-            "status": "error",
-            "message": f"Error in remediation task: {str(e)}",
-            "duration_seconds": time.time() - start_time
+            "status": "timeout",
+            "cloud_provider": cloud_provider,
+            "region": region,
+            "resource_type": resource_type,
+            "resource_count": 0
         }
+    
+    duration = time.time() - start_time
+    logger.info(
+        f"Scanned {resource_count} {cloud_provider} {resource_type} resources"
+        f"{f' in {region}' if region else ''} in {duration:.2f}s"
+    )
+    
+    return {
+        "status": "success",
+        "cloud_provider": cloud_provider,
+        "region": region,
+        "resource_type": resource_type,
+        "resource_count": resource_count
+    }
 
-# worker/scheduler.py
-"""
-Scheduler configuration for periodic tasks
-"""
-import logging
-from datetime import datetime, timedelta
-from typing import Dict
-
-from celery import Celery
-from celery.schedules import crontab
-
-from worker.tasks.scanner import scan_resources_task
-from worker.tasks.evaluator import evaluate_compliance_task
-
-# Configure Celery
-app = Celery('cloud_compliance_worker')
-
-# Set appropriate configuration for your environment
-app.conf.update(
-    broker_url='redis://localhost:6379/0',
-    result_backend='redis://localhost:6379/0',
-    timezone='UTC',
-    enable_utc=True,
-)
-
-# Configure periodic tasks
-app.conf.beat_schedule = {
-    'scan-resources-daily': {
-        'task': 'worker.tasks.scanner.scan_resources_task',
-        'schedule': crontab(hour=2, minute=0),  # Run at 2:00 AM every day
-        'args': (None,),  # Scan all providers
-    },
-    'evaluate-compliance-daily': {
-        'task': 'worker.tasks.evaluator.evaluate_compliance_task',
-        'schedule': crontab(hour=3, minute=0),  # Run at 3:00 AM every day
-    },
-    # Add additional scheduled tasks as needed
-}
+def aggregate_scan_task(
+    results: List[dict],
+    started_at: Optional[float] = None,
+    lock_keys: Optional[List[str]] = None,
+    lock_token: Optional[str] = None
+) -> dict:
+    """
+    Task to combine slice results once every slice of a scan has finished
+    
+    Args:
+        results: Return values of the scan_slice_task calls
+        started_at: Time the scan was dispatched
+        lock_keys: Keys of the scan locks taken by the dispatcher, if any
+        lock_token: Token the dispatcher holds the locks with
+    
+    Returns:
+        Dict with scan results
+    """
+    resource_count = sum(result["resource_count"] for result in results)
+    timed_out = [result for result in results if result.get("status") == "timeout"]
+    
+    # Slices write to the database directly, so retire the API's cached lists once at the end
+    invalidate_resource_lists()
+    
+    if lock_token:
+        release_locks(lock_keys, lock_token)
+    
+    duration = time.time() - started_at if started_at else None
+    logger.info(f"Completed resource scan of {len(results)} slices. Found {resource_count} resources.")
+    if timed_out:
+        logger.warning(f"{len(timed_out)} scan slices exceeded their time limit")
+    
+    return {
+        "status": "success",
+        "message": f"Scanned {resource_count} resources",
+        "resource_count": resource_count,
+        "slice_count": len(results),
+        "timed_out_slices": len(timed_out),
+        "duration_seconds": duration
+    }
 
-# Register tasks
-app.task(scan_resources_task)
-app.task(evaluate_compliance_task)
 
-if __name__ == '__main__':
-    app.start()
\ No newline at end of file
+def scan_failed_task(
+    task_id: str,
+    lock_keys: Optional[List[str]] = None,
+    lock_token: Optional[str] = None
+) -> dict:
+    """
+    Task run when a slice of a scan fails, in place of the aggregate task
+    
+    Celery marks the aggregate task failed, so the API reports the scan_id as failed;
+    this releases the scan locks so the next scheduled scan is not skipped.
+    
+    Args:
+        task_id: ID of the aggregate task, which is the scan's scan_id
+        lock_keys: Keys of the scan locks taken by the dispatcher, if any
+        lock_token: Token the dispatcher holds the locks with
+    
+    Returns:
+        Dict with the failed scan
+    """
+    if lock_token:
+        release_locks(lock_keys, lock_token)
+    
+    # The slices that succeeded have already written their resources
+    invalidate_resource_lists()
+    
+    logger.error(f"Resource scan {task_id} failed: a scan slice raised after its retries")
+    
+    return {
+        "status": "error",
+        "message": f"Resource scan {task_id} failed",
+        "scan_id": task_id
+    }
\ No newline at end of file